@@ -0,0 +1,232 @@
+"""
+FastAPI application factory for Meri Awaaz
+Builds the production app and its debug/test variants from one place
+"""
+import asyncio
+import importlib
+import re
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from dotenv import load_dotenv
+
+# Brotli compresses JSON better than gzip at similar CPU - optional, gzip is used without it
+try:
+    from brotli_asgi import BrotliMiddleware
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+# Load environment variables before any router touches Firebase
+load_dotenv()
+
+# CORS - frontend development servers and production origins (exact matches)
+CORS_ALLOWED_ORIGINS = frozenset({
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:3002",  # Admin dashboard
+    "http://localhost:5174",
+    "http://localhost:8080",  # Vite dev server alternate port
+    "http://127.0.0.1:5173",
+    "http://127.0.0.1:3002",  # Admin dashboard
+    "http://127.0.0.1:8080",
+    "https://localhost:5173",  # HTTPS versions
+    "https://localhost:3002",  # Admin dashboard HTTPS
+    "https://localhost:8080",
+    "https://meri-awaaz.vercel.app",  # Production domain
+})
+
+# Wildcard origins: Vercel deployments and ngrok tunnels (free tier, .io and .app domains)
+CORS_ALLOWED_ORIGIN_REGEX = r"https://[a-z0-9-]+(\.[a-z0-9-]+)*\.(vercel\.app|ngrok-free\.app|ngrok\.io|ngrok\.app)"
+
+CORS_ALLOWED_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+CORS_PREFLIGHT_MAX_AGE = 600
+
+# Responses smaller than this aren't worth compressing
+COMPRESSION_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+BROTLI_QUALITY = 4
+
+class PreflightMiddleware:
+    """
+    Answer CORS preflight requests from allowed origins directly
+
+    Mirrors what CORSMiddleware would reply for this app's settings, without
+    running the rest of the middleware stack or the router. Anything else,
+    including preflights from unknown origins or for methods outside
+    CORS_ALLOWED_METHODS, passes through unchanged (CORSMiddleware rejects those).
+    """
+
+    def __init__(self, app, allowed_origins: frozenset, allowed_origin_regex: str):
+        self.app = app
+        self.allowed_origins = frozenset(origin.encode() for origin in allowed_origins)
+        self.allowed_origin_regex = re.compile(allowed_origin_regex.encode())
+        self.allowed_methods = frozenset(method.encode() for method in CORS_ALLOWED_METHODS)
+        self.headers = [
+            (b"access-control-allow-methods", ", ".join(CORS_ALLOWED_METHODS).encode()),
+            (b"access-control-allow-credentials", b"true"),
+            (b"access-control-max-age", str(CORS_PREFLIGHT_MAX_AGE).encode()),
+            (b"vary", b"Origin"),
+            (b"content-length", b"0"),
+        ]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "OPTIONS":
+            headers = dict(scope["headers"])
+            origin = headers.get(b"origin")
+            if (origin and headers.get(b"access-control-request-method") in self.allowed_methods
+                    and (origin in self.allowed_origins or self.allowed_origin_regex.fullmatch(origin))):
+                response_headers = [(b"access-control-allow-origin", origin), *self.headers]
+                requested_headers = headers.get(b"access-control-request-headers")
+                if requested_headers:
+                    response_headers.append((b"access-control-allow-headers", requested_headers))
+                await send({"type": "http.response.start", "status": 204, "headers": response_headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+        await self.app(scope, receive, send)
+
+def _make_lifespan(use_firestore: bool):
+    """Lifespan manager for startup and shutdown events"""
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Startup
+        try:
+            if use_firestore:
+                from core.firestore_db import get_db_manager
+                # Connect now so the first request doesn't pay for client setup
+                await asyncio.to_thread(get_db_manager)
+                print("✅ Firestore database ready for connections")
+            else:
+                print("✅ Application startup complete")
+        except Exception as e:
+            print(f"❌ Application startup error: {e}")
+            # Don't raise here to allow the app to start in degraded mode
+
+        yield
+
+        # Shutdown
+        print("🔄 Application shutting down")
+        if use_firestore:
+            from core.firestore_db import close_db_manager
+            await close_db_manager()
+
+    return lifespan
+
+def _add_debug_routes(app: FastAPI):
+    """Route listing for checking which routers got registered"""
+    @app.get("/debug/routes")
+    async def debug_routes():
+        routes = []
+        for route in app.routes:
+            if hasattr(route, 'path') and hasattr(route, 'methods'):
+                routes.append({
+                    "path": route.path,
+                    "methods": list(route.methods),
+                    "name": getattr(route, 'name', 'unknown')
+                })
+        return {
+            "total_routes": len(routes),
+            "routes": routes,
+            "admin_routes": [r for r in routes if 'admin' in r['path']]
+        }
+
+def create_app(debug: bool = False,
+               include_fixed: bool = False,
+               agents_router: str = "ai_agents_working") -> FastAPI:
+    """
+    Build the Meri Awaaz API app
+
+    debug adds /debug/routes and logs router registration. include_fixed serves
+    only the standalone admin router from routers.ai_agents_fixed, without the
+    Firestore-backed routers. agents_router names the routers module that
+    provides the admin/AI agent endpoints otherwise. Only the routers a profile
+    uses are imported.
+    """
+    app = FastAPI(
+        title="Meri Awaaz API - Fixed" if include_fixed else "Meri Awaaz API",
+        description="Civic Voice Platform Backend API",
+        version="1.0.0",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=_make_lifespan(use_firestore=not include_fixed),
+        default_response_class=ORJSONResponse
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ALLOWED_ORIGINS,
+        allow_origin_regex=CORS_ALLOWED_ORIGIN_REGEX,
+        allow_credentials=True,
+        allow_methods=CORS_ALLOWED_METHODS,
+        allow_headers=["*"],
+    )
+    # Compress responses for clients that accept it (brotli, else gzip)
+    if BROTLI_AVAILABLE:
+        app.add_middleware(
+            BrotliMiddleware,
+            quality=BROTLI_QUALITY,
+            minimum_size=COMPRESSION_MINIMUM_SIZE,
+            gzip_fallback=True,
+        )
+    else:
+        app.add_middleware(
+            GZipMiddleware,
+            minimum_size=COMPRESSION_MINIMUM_SIZE,
+            compresslevel=GZIP_COMPRESS_LEVEL,
+        )
+    # Added last so it runs first
+    app.add_middleware(
+        PreflightMiddleware,
+        allowed_origins=CORS_ALLOWED_ORIGINS,
+        allowed_origin_regex=CORS_ALLOWED_ORIGIN_REGEX,
+    )
+
+    if debug:
+        _add_debug_routes(app)
+
+    # Include routers
+    if include_fixed:
+        from routers import ai_agents_fixed
+        app.include_router(ai_agents_fixed.router, prefix="/api", tags=["admin"])
+    else:
+        from routers import users, issues, verification
+        ai_agents = importlib.import_module(f"routers.{agents_router}")
+        app.include_router(users.router, prefix="/api", tags=["users"])
+        app.include_router(issues.router, prefix="/api", tags=["issues"])
+        app.include_router(verification.router, prefix="/api", tags=["verification"])
+        app.include_router(ai_agents.router, prefix="/api", tags=["ai-agents", "admin"])
+
+    if debug:
+        admin_routes = [r.path for r in app.routes if hasattr(r, 'path') and 'admin' in r.path]
+        print(f"✓ All routers included. Total routes: {len(app.routes)}")
+        print(f"✓ Admin routes: {admin_routes}")
+
+    # Health check endpoint
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy", "message": "Meri Awaaz API is running"}
+
+    # Test endpoint
+    @app.get("/")
+    async def root():
+        return {
+            "message": "Welcome to Meri Awaaz API",
+            "version": "1.0.0",
+            "status": "running"
+        }
+
+    # Global exception handler
+    @app.exception_handler(Exception)
+    async def global_exception_handler(request, exc):
+        return ORJSONResponse(
+            status_code=500,
+            content={
+                "success": False,
+                "message": "Internal server error",
+                "data": None
+            }
+        )
+
+    return app
@@ -0,0 +1,28 @@
+"""
+One-off backfill for data that predates the current Firestore layout
+Run from the backend directory: python backfill.py
+"""
+import asyncio
+
+from dotenv import load_dotenv
+
+# Load environment variables before connecting to Firebase
+load_dotenv()
+
+from core.firestore_db import get_db_manager, close_db_manager
+
+async def main():
+    manager = get_db_manager()
+    try:
+        # Geohashes for nearby search, on issues created before they were stored
+        updated = await manager.backfill_issue_geohashes()
+        print(f"✅ Added geohashes to {updated} issues")
+        
+        # Statistics counter shards, seeded with the issues written before them
+        counted = await manager.seed_issue_statistics()
+        print(f"✅ Seeded issue statistics from {counted} issues")
+    finally:
+        await close_db_manager()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4,57 +4,236 @@ Firebase JWT authentication dependency for FastAPI
 from fastapi import HTTPException, Depends, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import firebase_admin
-from firebase_admin import credentials, auth
+from firebase_admin import auth
+from cachetools import TTLCache
+from cryptography.x509 import load_pem_x509_certificate
+from google.auth.transport import requests as google_requests
+import asyncio
+import hashlib
+import json
+import jwt
+import logging
 import os
+import re
+import secrets
+import tempfile
+import threading
+import time
 from typing import Optional
 
-# Initialize Firebase Admin SDK
-def init_firebase():
-    if not firebase_admin._apps:
-        # Try to use environment variables first
-        project_id = os.getenv("FIREBASE_PROJECT_ID")
-        private_key_id = os.getenv("FIREBASE_PRIVATE_KEY_ID")
-        private_key = os.getenv("FIREBASE_PRIVATE_KEY")
-        client_email = os.getenv("FIREBASE_CLIENT_EMAIL")
-        client_id = os.getenv("FIREBASE_CLIENT_ID")
-        auth_uri = os.getenv("FIREBASE_AUTH_URI")
-        token_uri = os.getenv("FIREBASE_TOKEN_URI")
-        
-        if all([project_id, private_key_id, private_key, client_email]):
-            # Use environment variables to create credentials
-            firebase_config = {
-                "type": "service_account",
-                "project_id": project_id,
-                "private_key_id": private_key_id,
-                "private_key": private_key.replace('\\n', '\n'),  # Handle escaped newlines
-                "client_email": client_email,
-                "client_id": client_id,
-                "auth_uri": auth_uri or "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": token_uri or "https://oauth2.googleapis.com/token",
-                "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{client_email}"
-            }
-            cred = credentials.Certificate(firebase_config)
-            print("Firebase initialized with environment variables")
-        else:
-            # Fallback to service account key file
-            firebase_key_path = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
-            if firebase_key_path and os.path.exists(firebase_key_path):
-                cred = credentials.Certificate(firebase_key_path)
-                print("Firebase initialized with service account key file")
-            else:
-                # Last resort: use default credentials (for Google Cloud deployment)
-                cred = credentials.ApplicationDefault()
-                print("Firebase initialized with default credentials")
-        
-        firebase_admin.initialize_app(cred)
+from core.firebase_app import get_app
+
+logger = logging.getLogger(__name__)
+
+# Directory where Google's token-signing certificates are cached. Shared by
+# every worker on the host so only one of them pays for the cold-start fetch.
+KEY_CACHE_DIR = os.getenv(
+    "FIREBASE_KEY_CACHE_DIR",
+    os.path.join(tempfile.gettempdir(), "meri-awaaz-google-certs")
+)
+
+# Transport used to fetch the public keys; set by _install_shared_key_cache()
+_key_fetch_request = None
+
+def _install_shared_key_cache():
+    """
+    Route Firebase's public key fetch through an on-disk HTTP cache
+    
+    The cache honours the Cache-Control max-age Google sends with the
+    certificates (~6h). If the optional file cache backend is unavailable, or
+    the SDK no longer exposes its verifier's request, the SDK's default
+    per-process cache is left in place.
+    """
+    global _key_fetch_request
+    try:
+        import requests
+        from cachecontrol import CacheControl
+        from cachecontrol.caches.file_cache import FileCache
+    except ImportError:
+        logger.warning("Shared key cache not available - using per-process key cache")
+        return
+    
+    session = CacheControl(requests.Session(), cache=FileCache(KEY_CACHE_DIR))
+    _key_fetch_request = google_requests.Request(session=session)
+    try:
+        # Private SDK attribute; verify_id_token fetches keys through it
+        auth._get_client(None)._token_verifier.request = _key_fetch_request
+    except AttributeError as e:
+        logger.warning(f"Shared key cache not installed in the Firebase SDK - using per-process key cache: {e}")
 
-# Initialize Firebase on module import
-init_firebase()
+def init_firebase() -> firebase_admin.App:
+    """Initialize the shared Firebase app and the public key cache (idempotent)"""
+    app = get_app()
+    if _key_fetch_request is None:
+        _install_shared_key_cache()
+    return app
 
 # Security scheme for JWT Bearer token
 security = HTTPBearer()
 
+# Security scheme for endpoints that also serve guest users
+optional_security = HTTPBearer(auto_error=False)
+
+# Google's x509 certificates used to sign Firebase ID tokens
+FIREBASE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+DEFAULT_KEY_MAX_AGE_SECONDS = 6 * 60 * 60
+UNKNOWN_KID_REFRESH_SECONDS = 60
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+# Parsed RSA public keys by key ID, so verification never re-parses PEM
+_public_keys = {}
+_public_keys_expire_at = 0.0
+_public_keys_fetched_at = 0.0
+_public_keys_lock = threading.Lock()
+
+def _refresh_public_keys():
+    """Fetch Google's signing certificates and parse each one into a key object"""
+    global _public_keys, _public_keys_expire_at, _public_keys_fetched_at
+    init_firebase()
+    request = _key_fetch_request or google_requests.Request()
+    response = request(FIREBASE_CERTS_URL, method="GET")
+    if response.status != 200:
+        raise ValueError(f"Failed to fetch Firebase public keys: HTTP {response.status}")
+    
+    certs = json.loads(response.data)
+    keys = {
+        kid: load_pem_x509_certificate(pem.encode()).public_key()
+        for kid, pem in certs.items()
+    }
+    
+    match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+    max_age = int(match.group(1)) if match else DEFAULT_KEY_MAX_AGE_SECONDS
+    now = time.time()
+    with _public_keys_lock:
+        _public_keys = keys
+        _public_keys_expire_at = now + max_age
+        _public_keys_fetched_at = now
+
+def _get_project_id() -> Optional[str]:
+    """Project ID that ID tokens must be issued for"""
+    return os.getenv("FIREBASE_PROJECT_ID") or init_firebase().project_id
+
+def _token_key_id(token: str) -> Optional[str]:
+    """Key ID from an ID token's unverified header"""
+    try:
+        return jwt.get_unverified_header(token).get("kid")
+    except jwt.PyJWTError as e:
+        raise auth.InvalidIdTokenError(f"Malformed ID token: {e}", cause=e)
+
+def _verify_local(token: str, kid: Optional[str], project_id: str) -> dict:
+    """
+    Verify a Firebase ID token against the cached public keys with PyJWT
+    
+    Performs the same checks as auth.verify_id_token (signature, audience,
+    issuer, expiry, subject) and adds the "uid" claim. Pure CPU: refreshing
+    the keys is up to the caller.
+    
+    Raises:
+        auth.InvalidIdTokenError: If the token is malformed or fails verification
+        auth.ExpiredIdTokenError: If the token has expired
+    """
+    key = _public_keys.get(kid)
+    if key is None:
+        raise auth.InvalidIdTokenError("ID token has an unknown key ID")
+    
+    try:
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"require": ["exp", "iat", "sub"]}
+        )
+    except jwt.ExpiredSignatureError as e:
+        raise auth.ExpiredIdTokenError("ID token has expired", e)
+    except jwt.PyJWTError as e:
+        raise auth.InvalidIdTokenError(f"Invalid ID token: {e}", cause=e)
+    
+    subject = claims["sub"]
+    if not isinstance(subject, str) or not subject or len(subject) > 128:
+        raise auth.InvalidIdTokenError("ID token has an invalid subject claim")
+    
+    claims["uid"] = subject
+    return claims
+
+# Cache of verified token claims keyed by SHA-256 of the raw token, so repeat
+# requests with the same ID token skip the RSA signature check
+TOKEN_CACHE_TTL_SECONDS = 300
+_token_cache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL_SECONDS)
+_token_cache_lock = threading.Lock()
+
+def _cached_claims(token_key: bytes) -> Optional[dict]:
+    """
+    Previously verified claims for a token, if still valid
+
+    Entries are kept until min(token exp, now + TTL); a cached token past its
+    exp is evicted and has to be verified again.
+    """
+    with _token_cache_lock:
+        entry = _token_cache.get(token_key)
+    if entry is None:
+        return None
+    decoded_token, expires_at = entry
+    if expires_at > time.time():
+        return decoded_token
+    with _token_cache_lock:
+        _token_cache.pop(token_key, None)
+    return None
+
+def _cache_claims(token_key: bytes, decoded_token: dict):
+    """Remember verified claims for _cached_claims"""
+    now = time.time()
+    expires_at = min(decoded_token.get("exp", now), now + TOKEN_CACHE_TTL_SECONDS)
+    with _token_cache_lock:
+        _token_cache[token_key] = (decoded_token, expires_at)
+
+# The key refresh in flight, shared by every request that needs new keys
+_public_keys_refresh: Optional[asyncio.Future] = None
+
+async def _refresh_public_keys_shared():
+    """Refresh the public keys in a worker thread, joining a refresh already in flight"""
+    global _public_keys_refresh
+    if _public_keys_refresh is None or _public_keys_refresh.done():
+        _public_keys_refresh = asyncio.ensure_future(asyncio.to_thread(_refresh_public_keys))
+    await asyncio.shield(_public_keys_refresh)
+
+async def _verify_token(token: str) -> dict:
+    """
+    Verify a Firebase ID token without blocking the event loop
+    
+    Network I/O (the public key refresh, and the SDK fallback when no project
+    ID is configured) runs in worker threads; a key refresh is shared by all
+    requests waiting on it. Local verification is pure CPU against the cached
+    key objects and runs inline.
+    """
+    token_key = hashlib.sha256(token.encode()).digest()
+    decoded_token = _cached_claims(token_key)
+    if decoded_token is not None:
+        return decoded_token
+    
+    project_id = _get_project_id()
+    if not project_id:
+        # Without a project ID the audience cannot be checked locally
+        decoded_token = await asyncio.to_thread(auth.verify_id_token, token)
+    else:
+        kid = _token_key_id(token)
+        now = time.time()
+        # Unknown key IDs may mean Google rotated its keys; refetch at most
+        # once per UNKNOWN_KID_REFRESH_SECONDS so junk tokens can't force fetches
+        if now >= _public_keys_expire_at or (
+            kid not in _public_keys
+            and now - _public_keys_fetched_at >= UNKNOWN_KID_REFRESH_SECONDS
+        ):
+            await _refresh_public_keys_shared()
+        decoded_token = _verify_local(token, kid, project_id)
+    
+    _cache_claims(token_key, decoded_token)
+    return decoded_token
+
 async def verify_firebase_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -71,10 +250,8 @@ async def verify_firebase_token(
         HTTPException: If token is invalid or expired
     """
     try:
-        print(f"Received token: {credentials.credentials[:50]}..." if credentials.credentials else "No token received")
-        
         # Verify the token
-        decoded_token = auth.verify_id_token(credentials.credentials)
+        decoded_token = await _verify_token(credentials.credentials)
         
         # Return user information
         return {
@@ -105,23 +282,13 @@ async def verify_firebase_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-async def get_current_user(
-    user_data: dict = Depends(verify_firebase_token)
-) -> dict:
-    """
-    Get current authenticated user information
-    
-    Args:
-        user_data: Decoded Firebase token
-        
-    Returns:
-        dict: Current user information
-    """
-    return user_data
+# Current authenticated user. An alias rather than a wrapper dependency, so
+# FastAPI resolves one dependency per request instead of two.
+get_current_user = verify_firebase_token
 
 # Optional authentication dependency (for endpoints that work with or without auth)
 async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
 ) -> Optional[dict]:
     """
     Optional authentication dependency for endpoints that work with guest users
@@ -133,12 +300,14 @@ async def get_current_user_optional(
         dict or None: User information if authenticated, None if guest
     """
     if not credentials:
-        print("No credentials provided for optional auth")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("No credentials provided for optional auth")
         return None
         
     try:
-        print(f"Optional auth - Received token: {credentials.credentials[:50]}..." if credentials.credentials else "No token in credentials")
-        decoded_token = auth.verify_id_token(credentials.credentials)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Optional auth - verifying bearer token")
+        decoded_token = await _verify_token(credentials.credentials)
         return {
             "uid": decoded_token["uid"],
             "email": decoded_token.get("email"),
@@ -152,11 +321,11 @@ async def get_current_user_optional(
         return None
 
 # Admin-specific authentication
-ADMIN_EMAILS = [
+ADMIN_EMAILS = frozenset({
     "admin@meri-awaaz.com",
     "superadmin@meri-awaaz.com", 
     "administrator@meri-awaaz.com"
-]
+})
 
 # Demo admin credentials for development
 DEMO_ADMIN_CREDENTIALS = {
@@ -165,6 +334,32 @@ DEMO_ADMIN_CREDENTIALS = {
     "demo@admin.com": "demo123"
 }
 
+def demo_token_for(email: str) -> str:
+    """Build the demo admin token issued for a demo email"""
+    return f"demo-{email.replace('@', '-').replace('.', '-')}"
+
+# Demo email -> its demo token, built once for logins
+DEMO_TOKENS_BY_EMAIL = {email: demo_token_for(email) for email in DEMO_ADMIN_CREDENTIALS}
+
+def demo_login(email: str, password: str) -> Optional[str]:
+    """Demo admin token for valid demo credentials, else None; the password check is constant-time"""
+    stored_password = DEMO_ADMIN_CREDENTIALS.get(email)
+    if stored_password is None or not secrets.compare_digest(stored_password.encode(), password.encode()):
+        return None
+    return DEMO_TOKENS_BY_EMAIL[email]
+
+# Demo token -> admin user, built once so demo auth is a single dict lookup
+DEMO_TOKENS = {
+    demo_token_for(email): {
+        "uid": f"demo-admin-{email}",
+        "email": email,
+        "name": "Demo Admin",
+        "is_admin": True,
+        "auth_type": "demo"
+    }
+    for email in DEMO_ADMIN_CREDENTIALS
+}
+
 async def verify_admin_token(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> dict:
@@ -184,24 +379,17 @@ async def verify_admin_token(
         token = credentials.credentials
         
         # Check if it's a demo token (for development)
+        demo_admin = DEMO_TOKENS.get(token)
+        if demo_admin is not None:
+            return demo_admin
         if token.startswith("demo-"):
-            demo_email = token.replace("demo-", "").replace("-", "@")
-            if demo_email in DEMO_ADMIN_CREDENTIALS:
-                return {
-                    "uid": f"demo-admin-{demo_email}",
-                    "email": demo_email,
-                    "name": "Demo Admin",
-                    "is_admin": True,
-                    "auth_type": "demo"
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid demo admin credentials"
-                )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid demo admin credentials"
+            )
         
         # Otherwise verify as Firebase token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await _verify_token(token)
         user_email = decoded_token.get("email")
         
         # Check if user is an admin
@@ -0,0 +1,92 @@
+"""
+Shared Firebase Admin app for Meri Awaaz
+Initializes the default Firebase app once, on first use, for auth, Firestore and Storage
+"""
+
+import functools
+import logging
+import os
+import threading
+from typing import Optional
+
+import firebase_admin
+from firebase_admin import credentials
+
+logger = logging.getLogger(__name__)
+
+# Serializes first-time initialization when several modules race to it
+_init_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def service_account_info() -> dict:
+    """
+    Service account credentials dict built from FIREBASE_* environment variables
+
+    Built once per process; callers must not mutate the returned dict.
+    """
+    return {
+        "type": "service_account",
+        "project_id": os.getenv('FIREBASE_PROJECT_ID'),
+        "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
+        "private_key": os.getenv('FIREBASE_PRIVATE_KEY', '').replace('\\n', '\n'),  # Handle escaped newlines
+        "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
+        "client_id": os.getenv('FIREBASE_CLIENT_ID'),
+        "auth_uri": os.getenv('FIREBASE_AUTH_URI', 'https://accounts.google.com/o/oauth2/auth'),
+        "token_uri": os.getenv('FIREBASE_TOKEN_URI', 'https://oauth2.googleapis.com/token'),
+        "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
+        "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('FIREBASE_CLIENT_EMAIL')}"
+    }
+
+@functools.lru_cache(maxsize=1)
+def service_account_credential() -> Optional[credentials.Certificate]:
+    """
+    Certificate credential from the FIREBASE_* environment variables, parsed once
+
+    Returns None if the environment doesn't define a complete service account.
+    """
+    cred_dict = service_account_info()
+    if not all(cred_dict.get(field) for field in ('project_id', 'private_key', 'client_email')):
+        return None
+    return credentials.Certificate(cred_dict)
+
+def _load_credentials() -> credentials.Base:
+    """Pick credentials from environment variables, a key file, or the runtime default"""
+    cert = service_account_credential()
+    if cert is not None:
+        logger.info("Firebase initialized with environment variables")
+        return cert
+
+    # Fallback to service account key file
+    firebase_key_path = os.getenv("FIREBASE_SERVICE_ACCOUNT_KEY")
+    if firebase_key_path and os.path.exists(firebase_key_path):
+        logger.info("Firebase initialized with service account key file")
+        return credentials.Certificate(firebase_key_path)
+
+    # Last resort: use default credentials (for Google Cloud deployment)
+    logger.info("Firebase initialized with default credentials")
+    return credentials.ApplicationDefault()
+
+@functools.lru_cache(maxsize=1)
+def get_app() -> firebase_admin.App:
+    """
+    Get the default Firebase app, initializing it on first call
+
+    Safe to call from any module and any thread; credentials are only
+    loaded once per process.
+    """
+    with _init_lock:
+        try:
+            return firebase_admin.get_app()
+        except ValueError:
+            pass
+
+        options = {}
+        storage_bucket = os.getenv('FIREBASE_STORAGE_BUCKET')
+        if storage_bucket:
+            options['storageBucket'] = storage_bucket
+
+        try:
+            return firebase_admin.initialize_app(_load_credentials(), options)
+        except Exception as e:
+            logger.error(f"Failed to initialize Firebase: {e}")
+            raise
@@ -3,17 +3,81 @@ Firebase Storage Manager for Meri Awaaz
 Handles file uploads, downloads, and management using Firebase Storage
 """
 
+import asyncio
+import itertools
 import os
-import uuid
+import threading
 from typing import Optional, List, Tuple
-import firebase_admin
-from firebase_admin import credentials, storage
-from datetime import datetime, timedelta
+from google.cloud import storage as storage_client
+from google.api_core.exceptions import NotFound
+from google.cloud.storage.retry import DEFAULT_RETRY
+from google.oauth2 import service_account
+from datetime import datetime, timedelta, timezone
 import logging
+import re
 import urllib.parse
 
+from core.firebase_app import get_app, service_account_credential
+
 logger = logging.getLogger(__name__)
 
+# Content sniffing via libmagic - optional, extension checks still apply without it
+try:
+    import magic
+    # One shared instance: constructing it loads the magic database
+    _MAGIC = magic.Magic(mime=True)
+    MAGIC_AVAILABLE = True
+except ImportError:
+    _MAGIC = None
+    MAGIC_AVAILABLE = False
+    logger.warning("python-magic/libmagic not available - file contents won't be sniffed")
+
+# Maximum number of concurrent storage operations in batch uploads/deletes
+MAX_CONCURRENT_OPERATIONS = 8
+
+# Number of storage managers (each with its own client) per process
+STORAGE_POOL_SIZE = int(os.getenv("FIREBASE_STORAGE_POOL", "4"))
+
+# Maximum number of calls in a single storage batch request
+MAX_BATCH_SIZE = 100
+
+# Retry policy for uploads; bounded so a failing upload can't stall a request
+UPLOAD_RETRY = DEFAULT_RETRY.with_deadline(5.0)
+
+# Content types by lowercase file extension
+_CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'pdf': 'application/pdf',
+    'doc': 'application/msword',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'txt': 'text/plain',
+    'csv': 'text/csv',
+    'json': 'application/json'
+}
+
+# Other MIME types libmagic may report for a valid file of that extension
+_SNIFFED_TYPE_ALIASES = {
+    'docx': frozenset({'application/zip'}),
+    'doc': frozenset({'application/CDFV2', 'application/x-ole-storage'}),
+}
+
+# Number of leading bytes inspected when sniffing file contents
+SNIFF_BYTES = 2048
+
+# Extensions accepted for upload by default
+_ALLOWED_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'webp', 'pdf', 'doc', 'docx'})
+
+# Firebase Storage download URL; group 1 is the URL-encoded blob path
+_FIREBASE_URL_RE = re.compile(r"firebasestorage\.googleapis\.com/v0/b/[^/]+/o/([^?#]+)")
+
+def _file_extension(filename: str) -> str:
+    """Lowercase extension of a filename without the dot ('' if none)"""
+    return os.path.splitext(filename)[1][1:].lower()
+
 class FirebaseStorageManager:
     """Manages file operations with Firebase Storage"""
     
@@ -22,47 +86,19 @@ class FirebaseStorageManager:
         self._initialize_firebase()
     
     def _initialize_firebase(self):
-        """Initialize Firebase Admin SDK with service account credentials"""
+        """Connect to the Storage bucket of the shared Firebase app"""
+        # Get storage bucket through a dedicated client so pooled managers
+        # don't share one HTTP connection
         try:
-            # Check if Firebase is already initialized
-            firebase_admin.get_app()
-            logger.info("Firebase app already initialized")
-        except ValueError:
-            # Initialize Firebase with service account credentials from environment
-            try:
-                cred_dict = {
-                    "type": "service_account",
-                    "project_id": os.getenv('FIREBASE_PROJECT_ID'),
-                    "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
-                    "private_key": os.getenv('FIREBASE_PRIVATE_KEY', '').replace('\\n', '\n'),
-                    "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
-                    "client_id": os.getenv('FIREBASE_CLIENT_ID'),
-                    "auth_uri": os.getenv('FIREBASE_AUTH_URI', 'https://accounts.google.com/o/oauth2/auth'),
-                    "token_uri": os.getenv('FIREBASE_TOKEN_URI', 'https://oauth2.googleapis.com/token'),
-                    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                    "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('FIREBASE_CLIENT_EMAIL')}"
-                }
-                
-                # Validate required fields
-                required_fields = ['project_id', 'private_key', 'client_email']
-                missing_fields = [field for field in required_fields if not cred_dict.get(field)]
-                
-                if missing_fields:
-                    raise ValueError(f"Missing Firebase credentials: {missing_fields}")
-                
-                cred = credentials.Certificate(cred_dict)
-                firebase_admin.initialize_app(cred, {
-                    'storageBucket': os.getenv('FIREBASE_STORAGE_BUCKET')
-                })
-                logger.info("Firebase app initialized successfully")
-                
-            except Exception as e:
-                logger.error(f"Failed to initialize Firebase: {e}")
-                raise
-        
-        # Get storage bucket
-        try:
-            self.bucket = storage.bucket()
+            app = get_app()
+            bucket_name = app.options.get('storageBucket')
+            if not bucket_name:
+                raise ValueError("Storage bucket name not specified (set FIREBASE_STORAGE_BUCKET)")
+            client = storage_client.Client(
+                project=app.project_id,
+                credentials=app.credential.get_credential()
+            )
+            self.bucket = client.bucket(bucket_name)
             logger.info(f"Firebase Storage bucket connected: {self.bucket.name}")
         except Exception as e:
             logger.error(f"Failed to connect to Firebase Storage bucket: {e}")
@@ -70,23 +106,56 @@ class FirebaseStorageManager:
     
     def _generate_unique_filename(self, original_filename: str) -> str:
         """Generate a unique filename while preserving the extension"""
-        if '.' in original_filename:
-            name, extension = original_filename.rsplit('.', 1)
-            return f"{uuid.uuid4()}.{extension.lower()}"
-        else:
-            return str(uuid.uuid4())
+        # 64 random bits; names only need to be unique within a user's folder
+        name = os.urandom(8).hex()
+        extension = _file_extension(original_filename)
+        return f"{name}.{extension}" if extension else name
     
     def _validate_file_type(self, filename: str, allowed_types: List[str] = None) -> bool:
         """Validate file type based on extension"""
-        if allowed_types is None:
-            allowed_types = ['jpg', 'jpeg', 'png', 'gif', 'webp', 'pdf', 'doc', 'docx']
-        
-        if '.' not in filename:
+        extension = _file_extension(filename)
+        if not extension:
             return False
         
-        extension = filename.rsplit('.', 1)[1].lower()
+        if allowed_types is None:
+            return extension in _ALLOWED_EXTENSIONS
         return extension in allowed_types
     
+    def _validate_file_content(self, head: bytes, filename: str) -> bool:
+        """Check that the file's leading bytes match the type its extension claims"""
+        if not MAGIC_AVAILABLE:
+            return True
+        
+        extension = _file_extension(filename)
+        detected = _MAGIC.from_buffer(head[:SNIFF_BYTES])
+        return detected == _CONTENT_TYPES.get(extension) or detected in _SNIFFED_TYPE_ALIASES.get(extension, ())
+    
+    def _new_blob(self, original_filename: str, user_id: str, folder: str, file_size: int):
+        """Create a uniquely named blob with upload metadata set"""
+        # Create blob path: folder/user_id/unique_filename
+        unique_filename = self._generate_unique_filename(original_filename)
+        blob = self.bucket.blob(f"{folder}/{user_id}/{unique_filename}")
+        
+        # Set metadata
+        blob.metadata = {
+            'original_name': original_filename,
+            'uploaded_by': user_id,
+            'uploaded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'folder': folder,
+            'file_size': str(file_size)
+        }
+        return blob
+    
+    async def _publish(self, blob, make_public: bool) -> Optional[str]:
+        """Return the URL an uploaded blob is served from"""
+        # Make blob publicly readable if requested
+        if make_public:
+            await asyncio.to_thread(blob.make_public)
+            return blob.public_url
+        
+        # Generate a signed URL for private access
+        return await asyncio.to_thread(self.get_signed_url, blob.name, expiration_hours=24)
+    
     async def upload_file(self, 
                          file_content: bytes, 
                          original_filename: str, 
@@ -111,41 +180,25 @@ class FirebaseStorageManager:
             if not self._validate_file_type(original_filename):
                 logger.warning(f"Invalid file type: {original_filename}")
                 return None
+            if not self._validate_file_content(file_content, original_filename):
+                logger.warning(f"File content does not match its type: {original_filename}")
+                return None
             
-            # Generate unique filename
-            unique_filename = self._generate_unique_filename(original_filename)
-            
-            # Create blob path: folder/user_id/unique_filename
-            blob_path = f"{folder}/{user_id}/{unique_filename}"
-            blob = self.bucket.blob(blob_path)
-            
-            # Set metadata
-            blob.metadata = {
-                'original_name': original_filename,
-                'uploaded_by': user_id,
-                'uploaded_at': datetime.utcnow().isoformat(),
-                'folder': folder,
-                'file_size': str(len(file_content))
-            }
-            
-            # Determine content type based on file extension
-            content_type = self._get_content_type(original_filename)
+            blob = self._new_blob(original_filename, user_id, folder, len(file_content))
             
-            # Upload file with content type
-            blob.upload_from_string(
+            # Upload file with content type (blocking client call, run off the event loop)
+            # if_generation_match=0 makes this a create-only write, which also
+            # makes retrying it safe
+            await asyncio.to_thread(
+                blob.upload_from_string,
                 file_content,
-                content_type=content_type
+                content_type=self._get_content_type(original_filename),
+                if_generation_match=0,
+                retry=UPLOAD_RETRY
             )
             
-            # Make blob publicly readable if requested
-            if make_public:
-                blob.make_public()
-                public_url = blob.public_url
-            else:
-                # Generate a signed URL for private access
-                public_url = self.get_signed_url(blob_path, expiration_hours=24)
-            
-            logger.info(f"File uploaded successfully: {blob_path}")
+            public_url = await self._publish(blob, make_public)
+            logger.info(f"File uploaded successfully: {blob.name}")
             return public_url
             
         except Exception as e:
@@ -169,11 +222,20 @@ class FirebaseStorageManager:
         Returns:
             List of public URLs for successfully uploaded files
         """
-        uploaded_urls = []
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPERATIONS)
         
-        for file_content, filename in files:
-            url = await self.upload_file(file_content, filename, user_id, folder, make_public)
-            if url:
+        async def upload_one(file_content: bytes, filename: str) -> Optional[str]:
+            async with semaphore:
+                return await self.upload_file(file_content, filename, user_id, folder, make_public)
+        
+        results = await asyncio.gather(
+            *(upload_one(file_content, filename) for file_content, filename in files),
+            return_exceptions=True
+        )
+        
+        uploaded_urls = []
+        for (_, filename), url in zip(files, results):
+            if url and not isinstance(url, BaseException):
                 uploaded_urls.append(url)
             else:
                 logger.warning(f"Failed to upload file: {filename}")
@@ -199,18 +261,18 @@ class FirebaseStorageManager:
                 logger.error(f"Could not extract blob path from URL: {file_url}")
                 return False
             
-            # Delete the blob
+            # Delete the blob; a missing blob surfaces as NotFound
             blob = self.bucket.blob(blob_path)
             
-            # Check if blob exists before deleting
-            if blob.exists():
-                blob.delete()
-                logger.info(f"File deleted successfully: {blob_path}")
-                return True
-            else:
+            try:
+                await asyncio.to_thread(blob.delete)
+            except NotFound:
                 logger.warning(f"File does not exist: {blob_path}")
                 return False
             
+            logger.info(f"File deleted successfully: {blob_path}")
+            return True
+            
         except Exception as e:
             logger.error(f"Failed to delete file '{file_url}': {e}")
             return False
@@ -225,15 +287,54 @@ class FirebaseStorageManager:
         Returns:
             Number of files successfully deleted
         """
-        deleted_count = 0
-        
+        blob_paths = []
         for url in file_urls:
-            if await self.delete_file(url):
-                deleted_count += 1
+            blob_path = self._extract_blob_path_from_url(url)
+            if blob_path:
+                blob_paths.append(blob_path)
+        
+        try:
+            # One HTTP request per batch instead of one per file
+            await asyncio.to_thread(self._batch_delete, blob_paths)
+            deleted_count = len(blob_paths)
+        except Exception as e:
+            # A failed batch has still run its other deletes, and earlier batches
+            # committed, so the retry counts blobs that are already gone as deleted
+            logger.warning(f"Batch delete failed, deleting files individually: {e}")
+            deleted_count = await self._delete_individually(blob_paths)
         
         logger.info(f"Deleted {deleted_count}/{len(file_urls)} files successfully")
         return deleted_count
     
+    def _batch_delete(self, blob_paths: List[str]):
+        """Delete blobs using storage batch requests (blocking)"""
+        client = self.bucket.client
+        for start in range(0, len(blob_paths), MAX_BATCH_SIZE):
+            with client.batch():
+                for blob_path in blob_paths[start:start + MAX_BATCH_SIZE]:
+                    self.bucket.blob(blob_path).delete()
+    
+    async def _delete_individually(self, blob_paths: List[str]) -> int:
+        """Delete blobs one request each, with bounded concurrency; missing blobs count as deleted"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_OPERATIONS)
+        
+        async def delete_one(blob_path: str) -> bool:
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(self.bucket.blob(blob_path).delete)
+                except NotFound:
+                    pass
+                except Exception as e:
+                    logger.error(f"Failed to delete file '{blob_path}': {e}")
+                    return False
+                return True
+        
+        results = await asyncio.gather(
+            *(delete_one(blob_path) for blob_path in blob_paths),
+            return_exceptions=True
+        )
+        return sum(1 for result in results if result is True)
+    
     def get_signed_url(self, blob_path: str, expiration_hours: int = 1) -> Optional[str]:
         """
         Generate a signed URL for private file access
@@ -250,8 +351,10 @@ class FirebaseStorageManager:
             
             # Generate signed URL
             signed_url = blob.generate_signed_url(
-                expiration=datetime.utcnow() + timedelta(hours=expiration_hours),
-                method='GET'
+                version='v4',
+                expiration=timedelta(hours=expiration_hours),
+                method='GET',
+                credentials=self._get_signing_credentials()
             )
             
             logger.info(f"Generated signed URL for: {blob_path}")
@@ -261,6 +364,16 @@ class FirebaseStorageManager:
             logger.error(f"Failed to generate signed URL for '{blob_path}': {e}")
             return None
     
+    def _get_signing_credentials(self) -> Optional[service_account.Credentials]:
+        """
+        Service account credentials used to sign URLs, shared and parsed once per process
+        
+        Returns None when no private key is configured, in which case the
+        storage client's own credentials are used.
+        """
+        cert = service_account_credential()
+        return cert.get_credential() if cert is not None else None
+    
     def list_user_files(self, user_id: str, folder: str = None) -> List[dict]:
         """
         List all files uploaded by a specific user
@@ -301,63 +414,33 @@ class FirebaseStorageManager:
     
     def _extract_blob_path_from_url(self, file_url: str) -> Optional[str]:
         """Extract the blob path from a Firebase Storage public URL"""
-        try:
-            # Firebase Storage URLs format:
-            # https://firebasestorage.googleapis.com/v0/b/{bucket}/o/{path}?alt=media&token={token}
-            
-            if 'firebasestorage.googleapis.com' not in file_url:
-                logger.error(f"Not a Firebase Storage URL: {file_url}")
-                return None
-            
-            parsed_url = urllib.parse.urlparse(file_url)
-            
-            # Extract path between '/o/' and '?'
-            path_parts = parsed_url.path.split('/o/')
-            if len(path_parts) < 2:
-                logger.error(f"Invalid Firebase Storage URL format: {file_url}")
-                return None
-            
-            encoded_path = path_parts[1].split('?')[0]
-            blob_path = urllib.parse.unquote(encoded_path)
-            
-            return blob_path
-            
-        except Exception as e:
-            logger.error(f"Failed to extract blob path from URL '{file_url}': {e}")
+        # Firebase Storage URLs format:
+        # https://firebasestorage.googleapis.com/v0/b/{bucket}/o/{path}?alt=media&token={token}
+        match = _FIREBASE_URL_RE.search(file_url)
+        if not match:
+            logger.error(f"Invalid Firebase Storage URL format: {file_url}")
             return None
+        
+        return urllib.parse.unquote(match.group(1))
     
     def _get_content_type(self, filename: str) -> str:
         """Determine content type based on file extension"""
-        if '.' not in filename:
-            return 'application/octet-stream'
-        
-        extension = filename.rsplit('.', 1)[1].lower()
-        
-        content_types = {
-            'jpg': 'image/jpeg',
-            'jpeg': 'image/jpeg',
-            'png': 'image/png',
-            'gif': 'image/gif',
-            'webp': 'image/webp',
-            'pdf': 'application/pdf',
-            'doc': 'application/msword',
-            'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            'txt': 'text/plain',
-            'csv': 'text/csv',
-            'json': 'application/json'
-        }
-        
-        return content_types.get(extension, 'application/octet-stream')
+        return _CONTENT_TYPES.get(_file_extension(filename), 'application/octet-stream')
 
-# Global storage manager instance (will be initialized lazily)
-storage_manager = None
+# Pool of storage managers (created lazily on first use)
+_storage_pool: List[FirebaseStorageManager] = []
+_storage_pool_cycle = None
+_storage_pool_lock = threading.Lock()
 
 def get_storage_manager():
-    """Get or create the global storage manager instance"""
-    global storage_manager
-    if storage_manager is None:
-        storage_manager = FirebaseStorageManager()
-    return storage_manager
+    """Get a storage manager from the per-process pool (round-robin)"""
+    global _storage_pool_cycle
+    if _storage_pool_cycle is None:
+        with _storage_pool_lock:
+            if _storage_pool_cycle is None:
+                _storage_pool.extend(FirebaseStorageManager() for _ in range(max(1, STORAGE_POOL_SIZE)))
+                _storage_pool_cycle = itertools.cycle(_storage_pool)
+    return next(_storage_pool_cycle)
 
 # Convenience functions for easy import
 async def upload_file(file_content: bytes, filename: str, user_id: str, folder: str = "issues") -> Optional[str]:
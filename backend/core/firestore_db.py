@@ -5,76 +5,243 @@ Handles all database operations using Firestore
 
 import os
 import math
-from typing import Optional, List, Dict, Any, Tuple
+import random
+import asyncio
+import copy
+import json
+import threading
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
-import firebase_admin
-from firebase_admin import credentials, firestore
+from types import MappingProxyType
+from cachetools import TTLCache
+from firebase_admin import firestore
 from google.cloud.firestore_v1 import FieldFilter, Query
-from google.cloud.firestore import GeoPoint
+from google.cloud.firestore import GeoPoint, Increment
+from google.api_core import exceptions as gcp_exceptions
+from google.api_core.retry import Retry, if_exception_type
 import logging
+import numpy as np
+import pygeohash
+
+from core.firebase_app import get_app
 
 logger = logging.getLogger(__name__)
 
-# Status mapping for legacy compatibility
-STATUS_MAPPING = {
+# Redis shares cached user statistics between workers - optional, falls back to in-process only
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Upper bound on Firestore calls in flight per manager; beyond this extra
+# worker threads only add contention
+MAX_CONCURRENT_CALLS = 40
+
+# Firestore's limit on writes per batch commit
+MAX_BATCH_SIZE = 500
+
+# Retry policy for writes to hot documents (issues being voted on and updated).
+# Contention surfaces as ABORTED; short, capped backoff keeps tail latency bounded.
+WRITE_RETRY = Retry(
+    predicate=if_exception_type(
+        gcp_exceptions.Aborted,
+        gcp_exceptions.ServiceUnavailable,
+        gcp_exceptions.ResourceExhausted,
+        gcp_exceptions.DeadlineExceeded,
+    ),
+    initial=0.05,
+    multiplier=1.5,
+    maximum=1.0,
+    deadline=5,
+)
+
+# Geohash precision stored on issues (~150m cells); nearby queries use a prefix of it
+GEOHASH_PRECISION = 7
+KM_PER_DEGREE = 111.32
+EARTH_RADIUS_KM = 6371
+
+# Below this radius the equirectangular approximation is within ~0.1% of Haversine
+FLAT_EARTH_MAX_RADIUS_KM = 200
+KM_PER_DEGREE_LATITUDE = 110.57
+
+# How long user documents are served from memory before re-reading. Writes
+# only invalidate the worker that made them, so this bounds how stale another
+# worker's copy of a profile can be
+USER_CACHE_TTL_SECONDS = 2
+# phoneNumber -> user_id mappings; a hit is checked against the user document
+PHONE_CACHE_TTL_SECONDS = 60
+USER_CACHE_SIZE = 10000
+
+# get_user_vote calls arriving within this window are looked up together
+VOTE_BATCH_WINDOW_SECONDS = 0.002
+# Max values in a Firestore 'in' filter
+MAX_IN_FILTER_VALUES = 10
+
+# How long per-user statistics are cached in Redis, which writes invalidate
+# for every worker
+USER_STATS_CACHE_TTL_SECONDS = 60
+# How long a worker keeps its own copy; writes on other workers don't clear it
+USER_STATS_LOCAL_TTL_SECONDS = 2
+
+# Hard cap on issues returned by one get_issues call; page further with start_after
+MAX_ISSUES_PER_QUERY = 200
+
+# Issue statistics are kept as counters spread over this many shard documents
+# (stats/issues/shards/{n}) to stay under Firestore's per-document write rate
+ISSUE_STATS_SHARDS = 10
+
+# Vote counts are spread over this many shard documents per issue
+# (issues/{id}/counter_shards/{n}) so a trending issue isn't one hot document;
+# summed shard counts are cached this long
+VOTE_COUNTER_SHARDS = 10
+VOTE_COUNTS_CACHE_TTL_SECONDS = 5
+
+# Issue fields the API's issue listings render; listing queries project to these
+# and leave out processing/AI bookkeeping fields
+ISSUE_LISTING_FIELDS = (
+    'userId', 'authorId', 'authorName', 'authorProfileImageUrl',
+    'title', 'description', 'aiSummary', 'imageUrl', 'imageUrls', 'audioUrl',
+    'location', 'latitude', 'longitude', 'address', 'locationAddress',
+    'status', 'category', 'priority', 'voteCount', 'upvotes', 'downvotes', 'createdAt',
+)
+
+# Counted issue fields: (counter map, issue field, default when missing)
+_ISSUE_STATS_FIELDS = (
+    ('statuses', 'status', 'open'),
+    ('categories', 'category', 'General'),
+    ('priorities', 'priority', 'medium'),
+)
+
+# Current status values, passed through unchanged
+CURRENT_STATUSES = frozenset({'Submitted', 'In Progress', 'Resolved'})
+
+# Status mapping for legacy compatibility (read-only)
+STATUS_MAPPING = MappingProxyType({
     # Legacy status -> New status
     'pending': 'Submitted',
     'in-progress': 'In Progress', 
     'resolved': 'Resolved',
     'rejected': 'Resolved',  # Map rejected to resolved for now
+    'open': 'Submitted',  # Legacy 'open' -> 'Submitted'
     # Current status (ensure they pass through)
-    'Submitted': 'Submitted',
-    'In Progress': 'In Progress',
-    'Resolved': 'Resolved'
-}
+    **{status: status for status in CURRENT_STATUSES}
+})
+_normalize = STATUS_MAPPING.get
+
+# Stored status values (current and legacy) that count as resolved in statistics
+_RESOLVED_STATUSES = frozenset({'Resolved', 'resolved', 'rejected', 'closed'})
 
 def normalize_status(status: str) -> str:
     """Convert legacy status values to current format"""
-    return STATUS_MAPPING.get(status, 'Submitted')  # Default to Submitted if unknown
+    if status in CURRENT_STATUSES:
+        return status
+    return _normalize(status, 'Submitted')  # Default to Submitted if unknown
+
+def _geohash_precision_for_radius(radius_km: float, latitude: float) -> int:
+    """Finest geohash precision whose cells are at least radius_km on each side"""
+    lng_scale = max(math.cos(math.radians(latitude)), 0.01)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_bits = (5 * precision) // 2
+        lng_bits = 5 * precision - lat_bits
+        cell_height = 180 / (1 << lat_bits) * KM_PER_DEGREE
+        cell_width = 360 / (1 << lng_bits) * KM_PER_DEGREE * lng_scale
+        if min(cell_height, cell_width) >= radius_km:
+            return precision
+    return 1
+
+def _geohash_neighborhood(latitude: float, longitude: float, precision: int) -> set:
+    """Geohash of the cell containing a point plus its 8 neighbors"""
+    center = pygeohash.encode(latitude, longitude, precision=precision)
+    lat, lng, lat_err, lng_err = pygeohash.decode_exactly(center)
+    cells = set()
+    for dlat in (-1, 0, 1):
+        for dlng in (-1, 0, 1):
+            cell_lat = lat + dlat * 2 * lat_err
+            if not -90 <= cell_lat <= 90:
+                continue
+            cell_lng = (lng + dlng * 2 * lng_err + 180) % 360 - 180
+            cells.add(pygeohash.encode(cell_lat, cell_lng, precision=precision))
+    return cells
+
+def _haversine_km(latitude: float, longitude: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Haversine distances in km from one point to arrays of points"""
+    lat1_rad = math.radians(latitude)
+    lats_rad = np.radians(lats)
+    dlat = lats_rad - lat1_rad
+    dlng = np.radians(lngs) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1_rad) * np.cos(lats_rad) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def _issue_stats_delta(issue_data: Dict[str, Any], step: int) -> Dict[str, Any]:
+    """Counter increments that add (step=1) or remove (step=-1) an issue from the statistics"""
+    delta = {'total': Increment(step)}
+    for counter, field, default in _ISSUE_STATS_FIELDS:
+        delta[counter] = {issue_data.get(field, default): Increment(step)}
+    return delta
+
+def _issue_stats_change(current_data: Dict[str, Any], update_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Counter increments that move an issue between statistics buckets for an update (empty if none)"""
+    delta = {}
+    for counter, field, default in _ISSUE_STATS_FIELDS:
+        old_value = current_data.get(field, default)
+        new_value = update_data.get(field, old_value)
+        if new_value != old_value:
+            delta[counter] = {old_value: Increment(-1), new_value: Increment(1)}
+    return delta
+
+def _equirectangular_km(latitude: float, longitude: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Flat-earth approximation of distances in km from one point to arrays of nearby points"""
+    dx = (lngs - longitude) * (math.cos(math.radians(latitude)) * KM_PER_DEGREE)
+    dy = (lats - latitude) * KM_PER_DEGREE_LATITUDE
+    return np.sqrt(dx * dx + dy * dy)
+
+def _issue_dict(doc) -> Dict[str, Any]:
+    """Issue snapshot as a dict, with its ID and the GeoPoint unpacked to latitude/longitude"""
+    issue_data = doc.to_dict()
+    issue_data['id'] = doc.id
+    geopoint = issue_data.get('location')
+    if geopoint:
+        issue_data['latitude'] = geopoint.latitude
+        issue_data['longitude'] = geopoint.longitude
+    return issue_data
+
+def _fetch(query) -> list:
+    """Run a query to completion, returning its document snapshots"""
+    return list(query.stream())
+
+def _fetch_all(db, refs: list) -> list:
+    """Read several documents in one round-trip, returning their snapshots in any order"""
+    return list(db.get_all(refs))
 
 class FirestoreManager:
     """Manages all Firestore database operations for Meri Awaaz"""
     
     def __init__(self):
         self.db = None
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+        # user_id -> user dict, and phoneNumber -> user_id; only touched from the event loop
+        self._user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+        self._phone_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=PHONE_CACHE_TTL_SECONDS)
+        # (collection, key) -> fetch shared by concurrent identical reads
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        # user_id -> statistics
+        self._stats_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_STATS_LOCAL_TTL_SECONDS)
+        # issue_id -> (upvotes, downvotes) summed over its vote counter shards
+        self._vote_counts_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=VOTE_COUNTS_CACHE_TTL_SECONDS)
+        # (issue_id, user_id) -> vote snapshot (or None) for the next batched lookup
+        self._pending_votes: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._vote_flush_task: Optional[asyncio.Task] = None
+        # Set once backfill.py has given every issue a geohash
+        self._geohash_backfilled = False
+        redis_url = os.getenv('REDIS_URL')
+        self._redis = aioredis.from_url(redis_url) if REDIS_AVAILABLE and redis_url else None
         self._initialize_firestore()
     
     def _initialize_firestore(self):
-        """Initialize Firestore client"""
-        try:
-            # Check if Firebase is already initialized
-            firebase_admin.get_app()
-            logger.info("Firebase app already initialized")
-        except ValueError:
-            # Initialize Firebase with service account credentials
-            try:
-                cred_dict = {
-                    "type": "service_account",
-                    "project_id": os.getenv('FIREBASE_PROJECT_ID'),
-                    "private_key_id": os.getenv('FIREBASE_PRIVATE_KEY_ID'),
-                    "private_key": os.getenv('FIREBASE_PRIVATE_KEY', '').replace('\\n', '\n'),
-                    "client_email": os.getenv('FIREBASE_CLIENT_EMAIL'),
-                    "client_id": os.getenv('FIREBASE_CLIENT_ID'),
-                    "auth_uri": os.getenv('FIREBASE_AUTH_URI', 'https://accounts.google.com/o/oauth2/auth'),
-                    "token_uri": os.getenv('FIREBASE_TOKEN_URI', 'https://oauth2.googleapis.com/token'),
-                    "auth_provider_x509_cert_url": "https://www.googleapis.com/oauth2/v1/certs",
-                    "client_x509_cert_url": f"https://www.googleapis.com/robot/v1/metadata/x509/{os.getenv('FIREBASE_CLIENT_EMAIL')}"
-                }
-                
-                # Validate required fields
-                required_fields = ['project_id', 'private_key', 'client_email']
-                missing_fields = [field for field in required_fields if not cred_dict.get(field)]
-                
-                if missing_fields:
-                    raise ValueError(f"Missing Firebase credentials: {missing_fields}")
-                
-                cred = credentials.Certificate(cred_dict)
-                firebase_admin.initialize_app(cred)
-                logger.info("Firebase app initialized successfully")
-                
-            except Exception as e:
-                logger.error(f"Failed to initialize Firebase: {e}")
-                raise
+        """Initialize Firestore client on the shared Firebase app"""
+        get_app()
         
         # Get Firestore client
         try:
@@ -84,19 +251,121 @@ class FirestoreManager:
             logger.error(f"Failed to initialize Firestore client: {e}")
             raise
     
+    async def close(self):
+        """Close the Firestore client's gRPC channel and the Redis connection pool"""
+        if self._redis is not None:
+            await self._redis.close()
+        if self.db is not None:
+            await asyncio.to_thread(self.db.close)
+    
+    async def _call(self, fn, *args, **kwargs):
+        """Run a blocking Firestore SDK call in a worker thread"""
+        async with self._semaphore:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+    
+    async def _get_documents(self, collection: str, doc_ids: List[str]) -> Dict[str, Any]:
+        """Read documents by ID in get_all round-trips of up to MAX_BATCH_SIZE, keyed by ID"""
+        refs = [self.db.collection(collection).document(doc_id) for doc_id in dict.fromkeys(doc_ids)]
+        chunks = await asyncio.gather(*(
+            self._call(_fetch_all, self.db, refs[start:start + MAX_BATCH_SIZE])
+            for start in range(0, len(refs), MAX_BATCH_SIZE)
+        ))
+        return {doc.id: doc for docs in chunks for doc in docs if doc.exists}
+    
+    def _issue_stats_shard(self, shard: Optional[int] = None):
+        """One shard of the issue statistics counters, a random one unless given"""
+        if shard is None:
+            shard = random.randrange(ISSUE_STATS_SHARDS)
+        return self.db.collection('stats').document('issues').collection('shards').document(str(shard))
+    
+    def _vote_counter_shard(self, issue_id: str, shard: int):
+        """One of an issue's vote counter shards"""
+        return self.db.collection('issues').document(issue_id).collection('counter_shards').document(str(shard))
+    
+    async def _add_vote_shard_counts(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add the votes held in counter shards to freshly read issue dicts, in place
+        
+        Issue documents keep the counts from before sharding; votes since then
+        live only in the shards, which are read by reference in get_all
+        round-trips of up to MAX_BATCH_SIZE documents.
+        """
+        missing = list(dict.fromkeys(issue['id'] for issue in issues if issue['id'] not in self._vote_counts_cache))
+        if missing:
+            refs = [
+                self._vote_counter_shard(issue_id, shard)
+                for issue_id in missing for shard in range(VOTE_COUNTER_SHARDS)
+            ]
+            results = await asyncio.gather(*(
+                self._call(_fetch_all, self.db, refs[start:start + MAX_BATCH_SIZE])
+                for start in range(0, len(refs), MAX_BATCH_SIZE)
+            ))
+            counts = {issue_id: [0, 0] for issue_id in missing}
+            for docs in results:
+                for doc in docs:
+                    if not doc.exists:
+                        continue
+                    shard = doc.to_dict()
+                    issue_counts = counts[doc.reference.parent.parent.id]
+                    issue_counts[0] += shard.get('upvotes', 0)
+                    issue_counts[1] += shard.get('downvotes', 0)
+            for issue_id, (upvotes, downvotes) in counts.items():
+                self._vote_counts_cache[issue_id] = (upvotes, downvotes)
+        
+        for issue in issues:
+            upvotes, downvotes = self._vote_counts_cache.get(issue['id'], (0, 0))
+            # voteCount mirrors upvotes (positive only); downvotes are kept for analytics
+            issue['upvotes'] = issue.get('upvotes', 0) + upvotes
+            issue['voteCount'] = issue.get('voteCount', 0) + upvotes
+            issue['downvotes'] = issue.get('downvotes', 0) + downvotes
+        return issues
+    
+    async def _single_flight(self, key: Tuple[str, str], fn: Callable[..., Awaitable], *args):
+        """Await fn(*args), sharing one call among concurrent callers with the same key"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others' read
+        return await asyncio.shield(future)
+    
+    async def _invalidate_user_aggregates(self, user_id: Optional[str]):
+        """Drop cached statistics for a user after a write that changes them"""
+        if not user_id:
+            return
+        self._stats_cache.pop(user_id, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(f"userstats:{user_id}")
+            except Exception as e:
+                logger.warning(f"Failed to invalidate cached statistics for {user_id}: {e}")
+    
+    async def _delete_refs(self, refs: List[Any]):
+        """Delete documents in batch commits of up to MAX_BATCH_SIZE, committed concurrently"""
+        batches = []
+        for start in range(0, len(refs), MAX_BATCH_SIZE):
+            batch = self.db.batch()
+            for ref in refs[start:start + MAX_BATCH_SIZE]:
+                batch.delete(ref)
+            batches.append(batch)
+        
+        await asyncio.gather(*(self._call(batch.commit) for batch in batches))
+    
     # ==================== User Management ====================
     
     async def create_user(self, user_data: Dict[str, Any]) -> Optional[str]:
         """Create a new user document"""
         try:
             # Add timestamps
-            user_data['createdAt'] = datetime.utcnow()
-            user_data['updatedAt'] = datetime.utcnow()
+            now = datetime.utcnow()
+            user_data['createdAt'] = now
+            user_data['updatedAt'] = now
             user_data['isVerified'] = user_data.get('isVerified', False)
             
             # Create document with auto-generated ID
             doc_ref = self.db.collection('users').document()
-            doc_ref.set(user_data)
+            await self._call(doc_ref.set, user_data)
             
             logger.info(f"User created with ID: {doc_ref.id}")
             return doc_ref.id
@@ -107,31 +376,68 @@ class FirestoreManager:
     
     async def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Get user by ID"""
+        cached = self._user_cache.get(user_id)
+        if cached is not None:
+            return dict(cached)
+        
         try:
-            doc = self.db.collection('users').document(user_id).get()
+            doc = await self._single_flight(
+                ('users', user_id), self._call, self.db.collection('users').document(user_id).get
+            )
             if doc.exists:
                 user_data = doc.to_dict()
                 user_data['id'] = doc.id
-                return user_data
+                self._user_cache[user_id] = user_data
+                return dict(user_data)
             return None
             
         except Exception as e:
             logger.error(f"Failed to get user {user_id}: {e}")
             return None
     
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several users by ID, in the order given; missing users are skipped"""
+        try:
+            missing = [user_id for user_id in user_ids if user_id not in self._user_cache]
+            if missing:
+                for doc in (await self._get_documents('users', missing)).values():
+                    user_data = doc.to_dict()
+                    user_data['id'] = doc.id
+                    self._user_cache[doc.id] = user_data
+            
+            users = []
+            for user_id in user_ids:
+                cached = self._user_cache.get(user_id)
+                if cached is not None:
+                    users.append(dict(cached))
+            return users
+            
+        except Exception as e:
+            logger.error(f"Failed to get users {user_ids}: {e}")
+            return []
+    
     async def get_user_by_phone(self, phone_number: str) -> Optional[Dict[str, Any]]:
         """Get user by phone number"""
+        cached_id = self._phone_cache.get(phone_number)
+        if cached_id is not None:
+            user_data = await self.get_user(cached_id)
+            if user_data and user_data.get('phoneNumber') == phone_number:
+                return user_data
+            self._phone_cache.pop(phone_number, None)
+        
         try:
             query = self.db.collection('users').where(
                 filter=FieldFilter('phoneNumber', '==', phone_number)
             ).limit(1)
             
-            docs = list(query.stream())
+            docs = await self._single_flight(('phoneNumber', phone_number), self._call, _fetch, query)
             if docs:
                 doc = docs[0]
                 user_data = doc.to_dict()
                 user_data['id'] = doc.id
-                return user_data
+                self._user_cache[doc.id] = user_data
+                self._phone_cache[phone_number] = doc.id
+                return dict(user_data)
             return None
             
         except Exception as e:
@@ -144,7 +450,11 @@ class FirestoreManager:
             update_data['updatedAt'] = datetime.utcnow()
             
             # Use set with merge=True to create document if it doesn't exist
-            self.db.collection('users').document(user_id).set(update_data, merge=True)
+            await self._call(
+                self.db.collection('users').document(user_id).set, update_data, merge=True, retry=WRITE_RETRY
+            )
+            self._user_cache.pop(user_id, None)
+            await self._invalidate_user_aggregates(user_id)
             logger.info(f"User updated: {user_id}")
             return True
             
@@ -155,7 +465,8 @@ class FirestoreManager:
     async def delete_user(self, user_id: str) -> bool:
         """Delete user document"""
         try:
-            self.db.collection('users').document(user_id).delete()
+            await self._call(self.db.collection('users').document(user_id).delete)
+            self._user_cache.pop(user_id, None)
             logger.info(f"User deleted: {user_id}")
             return True
             
@@ -169,8 +480,9 @@ class FirestoreManager:
         """Create a new civic issue"""
         try:
             # Add timestamps and default values
-            issue_data['createdAt'] = datetime.utcnow()
-            issue_data['updatedAt'] = datetime.utcnow()
+            now = datetime.utcnow()
+            issue_data['createdAt'] = now
+            issue_data['updatedAt'] = now
             issue_data['status'] = normalize_status(issue_data.get('status', 'Submitted'))
             issue_data['priority'] = issue_data.get('priority', 'medium')
             issue_data['voteCount'] = 0
@@ -182,14 +494,19 @@ class FirestoreManager:
                 latitude = float(issue_data.pop('latitude'))
                 longitude = float(issue_data.pop('longitude'))
                 issue_data['location'] = GeoPoint(latitude, longitude)
+                issue_data['geohash'] = pygeohash.encode(latitude, longitude, precision=GEOHASH_PRECISION)
             
             # Ensure arrays are properly formatted
             if 'imageUrls' not in issue_data:
                 issue_data['imageUrls'] = []
             
-            # Create document
+            # Create document and count it in the statistics
             doc_ref = self.db.collection('issues').document()
-            doc_ref.set(issue_data)
+            batch = self.db.batch()
+            batch.set(doc_ref, issue_data)
+            batch.set(self._issue_stats_shard(), _issue_stats_delta(issue_data, 1), merge=True)
+            await self._call(batch.commit)
+            await self._invalidate_user_aggregates(issue_data.get('userId'))
             
             logger.info(f"Issue created with ID: {doc_ref.id}")
             return doc_ref.id
@@ -201,61 +518,62 @@ class FirestoreManager:
     async def get_issue(self, issue_id: str) -> Optional[Dict[str, Any]]:
         """Get issue by ID"""
         try:
-            doc = self.db.collection('issues').document(issue_id).get()
+            doc = await self._single_flight(
+                ('issues', issue_id), self._call, self.db.collection('issues').document(issue_id).get
+            )
             if doc.exists:
-                issue_data = doc.to_dict()
-                issue_data['id'] = doc.id
-                
-                # Convert GeoPoint back to latitude/longitude
-                if 'location' in issue_data and issue_data['location']:
-                    geopoint = issue_data['location']
-                    issue_data['latitude'] = geopoint.latitude
-                    issue_data['longitude'] = geopoint.longitude
-                
-                return issue_data
+                return (await self._add_vote_shard_counts([_issue_dict(doc)]))[0]
             return None
             
         except Exception as e:
             logger.error(f"Failed to get issue {issue_id}: {e}")
             return None
     
+    async def get_issues_by_ids(self, issue_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several issues by ID, in the order given; missing issues are skipped"""
+        try:
+            docs = await self._get_documents('issues', issue_ids)
+            return await self._add_vote_shard_counts(
+                [_issue_dict(docs[issue_id]) for issue_id in issue_ids if issue_id in docs]
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to get issues {issue_ids}: {e}")
+            return []
+    
     async def get_issues(self, 
                         limit: int = 50, 
                         category: str = None,
                         status: str = None,
                         user_id: str = None,
-                        priority: str = None) -> List[Dict[str, Any]]:
-        """Get issues with optional filters"""
+                        priority: str = None,
+                        start_after: Optional[str] = None,
+                        offset: int = 0,
+                        fields: Optional[Tuple[str, ...]] = None) -> List[Dict[str, Any]]:
+        """
+        Get issues with optional filters, newest first
+        
+        At most MAX_ISSUES_PER_QUERY issues are returned; pass the ID of the last
+        issue of a page as start_after to get the next one, or skip offset
+        issues instead. fields limits the returned documents to those fields
+        (e.g. ISSUE_LISTING_FIELDS).
+        
+        Every filter combination ordered by createdAt needs a composite index
+        (Firebase console or firestore.indexes.json), otherwise the query fails:
+          category + createdAt DESC, status + createdAt DESC, userId + createdAt DESC,
+          priority + createdAt DESC, and one per combination of those filters used
+          together (e.g. userId + status + createdAt DESC).
+        """
         try:
-            query = self.db.collection('issues')
-            
-            # Apply filters
-            if category:
-                query = query.where(filter=FieldFilter('category', '==', category))
-            if status:
-                # Normalize status to handle legacy values
-                normalized_status = normalize_status(status)
-                query = query.where(filter=FieldFilter('status', '==', normalized_status))
-            if user_id:
-                query = query.where(filter=FieldFilter('userId', '==', user_id))
-            if priority:
-                query = query.where(filter=FieldFilter('priority', '==', priority))
-            
-            # Order by creation date (newest first) and limit
-            query = query.order_by('createdAt', direction=Query.DESCENDING).limit(limit)
-            
-            issues = []
-            for doc in query.stream():
-                issue_data = doc.to_dict()
-                issue_data['id'] = doc.id
-                
-                # Convert GeoPoint to latitude/longitude
-                if 'location' in issue_data and issue_data['location']:
-                    geopoint = issue_data['location']
-                    issue_data['latitude'] = geopoint.latitude
-                    issue_data['longitude'] = geopoint.longitude
-                
-                issues.append(issue_data)
+            cursor = None
+            if start_after:
+                cursor = await self._call(self.db.collection('issues').document(start_after).get)
+                if not cursor.exists:
+                    cursor = None
+            issues, _ = await self._query_issues(
+                limit, category=category, status=status, user_id=user_id,
+                priority=priority, cursor=cursor, offset=offset, fields=fields
+            )
             
             logger.info(f"Retrieved {len(issues)} issues")
             return issues
@@ -264,6 +582,93 @@ class FirestoreManager:
             logger.error(f"Failed to get issues: {e}")
             return []
     
+    def _filtered_issues(self,
+                         category: str = None,
+                         status: str = None,
+                         user_id: str = None,
+                         priority: str = None,
+                         fields: Optional[Tuple[str, ...]] = None):
+        """Issues query with the given equality filters applied"""
+        query = self.db.collection('issues')
+        if fields:
+            query = query.select(list(fields))
+        
+        # Apply filters
+        if category:
+            query = query.where(filter=FieldFilter('category', '==', category))
+        if status:
+            # Normalize status to handle legacy values
+            normalized_status = normalize_status(status)
+            query = query.where(filter=FieldFilter('status', '==', normalized_status))
+        if user_id:
+            query = query.where(filter=FieldFilter('userId', '==', user_id))
+        if priority:
+            query = query.where(filter=FieldFilter('priority', '==', priority))
+        return query
+    
+    async def _query_issues(self,
+                            limit: int,
+                            category: str = None,
+                            status: str = None,
+                            user_id: str = None,
+                            priority: str = None,
+                            cursor: Any = None,
+                            offset: int = 0,
+                            fields: Optional[Tuple[str, ...]] = None) -> Tuple[List[Dict[str, Any]], Any]:
+        """
+        One page of filtered issues, newest first, and the snapshot to start the next page after
+        
+        The page continues after the cursor snapshot if given, then skips offset
+        issues. Errors propagate.
+        """
+        limit = min(limit, MAX_ISSUES_PER_QUERY)
+        query = self._filtered_issues(category, status, user_id, priority, fields)
+        
+        # Order by creation date (newest first) and limit
+        query = query.order_by('createdAt', direction=Query.DESCENDING).limit(limit)
+        if cursor is not None:
+            query = query.start_after(cursor)
+        if offset:
+            query = query.offset(offset)
+        
+        docs = await self._call(_fetch, query)
+        issues = [_issue_dict(doc) for doc in docs]
+        await self._add_vote_shard_counts(issues)
+        return issues, docs[-1] if docs else None
+    
+    async def get_user_issues(self,
+                              user_id: str,
+                              limit: int = 50,
+                              status: str = None) -> List[Dict[str, Any]]:
+        """
+        Get up to limit of a user's issues (ISSUE_LISTING_FIELDS only), newest first
+        
+        Reads in pages of MAX_ISSUES_PER_QUERY, each continuing from the previous
+        page's last snapshot. Errors propagate, so a failed read is never
+        mistaken for a short list.
+        """
+        issues = []
+        cursor = None
+        while len(issues) < limit:
+            page_size = min(MAX_ISSUES_PER_QUERY, limit - len(issues))
+            page, cursor = await self._query_issues(
+                page_size, user_id=user_id, status=status, cursor=cursor, fields=ISSUE_LISTING_FIELDS
+            )
+            issues.extend(page)
+            if len(page) < page_size:
+                break
+        return issues
+    
+    async def count_issues(self,
+                           category: str = None,
+                           status: str = None,
+                           user_id: str = None,
+                           priority: str = None) -> int:
+        """Number of issues matching the filters, counted server-side. Errors propagate."""
+        count_query = self._filtered_issues(category, status, user_id, priority).count()
+        result = await self._call(count_query.get)
+        return result[0][0].value
+    
     async def get_nearby_issues(self, 
                                latitude: float, 
                                longitude: float, 
@@ -271,36 +676,71 @@ class FirestoreManager:
                                limit: int = 50) -> List[Dict[str, Any]]:
         """Get issues near a specific location"""
         try:
-            # Get all issues with location data
-            # Note: Firestore doesn't support native radius queries
-            # For production, consider using a geospatial library or service
-            query = self.db.collection('issues').where(
-                filter=FieldFilter('location', '!=', None)
-            ).limit(limit * 3)  # Get more to filter by distance
-            
-            issues_with_distance = []
-            
-            for doc in query.stream():
-                issue_data = doc.to_dict()
-                issue_data['id'] = doc.id
-                
-                if 'location' in issue_data and issue_data['location']:
-                    geopoint = issue_data['location']
-                    issue_lat = geopoint.latitude
-                    issue_lng = geopoint.longitude
-                    
-                    # Calculate distance
-                    distance = self._calculate_distance(latitude, longitude, issue_lat, issue_lng)
-                    
-                    if distance <= radius_km:
-                        issue_data['latitude'] = issue_lat
-                        issue_data['longitude'] = issue_lng
-                        issue_data['distance'] = round(distance, 2)
-                        issues_with_distance.append(issue_data)
-            
-            # Sort by distance and limit
-            issues_with_distance.sort(key=lambda x: x.get('distance', float('inf')))
-            nearby_issues = issues_with_distance[:limit]
+            # Firestore has no radius queries: fetch the geohash cells covering
+            # the radius, then filter the candidates by exact distance
+            precision = _geohash_precision_for_radius(radius_km, latitude)
+            queries = [
+                self.db.collection('issues')
+                .select(['location'])
+                .where(filter=FieldFilter('geohash', '>=', cell))
+                .where(filter=FieldFilter('geohash', '<', cell + '~'))
+                .limit(limit * 3)  # Get more to filter by distance
+                for cell in _geohash_neighborhood(latitude, longitude, precision)
+            ]
+            legacy_scan = not await self._is_geohash_backfilled()
+            if legacy_scan:
+                # Issues from before geohashes were stored are missed by the cell
+                # queries; scan for them the old way until they are backfilled
+                queries.append(
+                    self.db.collection('issues')
+                    .select(['location', 'geohash'])
+                    .where(filter=FieldFilter('location', '!=', None))
+                    .limit(limit * 3)
+                )
+            results = await asyncio.gather(*(self._call(_fetch, query) for query in queries))
+            
+            candidates = []
+            coords = []
+            add_candidate = candidates.append
+            add_coords = coords.append
+            for query_index, docs in enumerate(results):
+                from_legacy_scan = legacy_scan and query_index == len(results) - 1
+                for doc in docs:
+                    issue_data = doc.to_dict()
+                    if from_legacy_scan and issue_data.get('geohash'):
+                        continue  # Covered by the cell queries
+                    geopoint = issue_data.get('location')
+                    if geopoint:
+                        add_candidate((doc.reference, geopoint))
+                        add_coords((geopoint.latitude, geopoint.longitude))
+            
+            # Calculate all distances at once
+            coords = np.array(coords, dtype=np.float64).reshape(-1, 2)
+            lats, lngs = coords[:, 0], coords[:, 1]
+            distance_fn = _equirectangular_km if radius_km <= FLAT_EARTH_MAX_RADIUS_KM else _haversine_km
+            distances = distance_fn(latitude, longitude, lats, lngs)
+            
+            # Keep the closest `limit` within the radius, nearest first
+            within = np.flatnonzero(distances <= radius_km)
+            if len(within) > limit:
+                within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+            within = within[np.argsort(distances[within], kind='stable')]
+            if len(within) == 0:
+                return []
+            
+            # Only the survivors are read in full
+            full_docs = await self._call(_fetch_all, self.db, [candidates[i][0] for i in within])
+            issues_by_id = {doc.id: doc for doc in full_docs if doc.exists}
+            
+            nearby_issues = []
+            for i in within:
+                doc = issues_by_id.get(candidates[i][0].id)
+                if doc is None:
+                    continue
+                issue_data = _issue_dict(doc)
+                issue_data['distance'] = round(float(distances[i]), 2)
+                nearby_issues.append(issue_data)
+            await self._add_vote_shard_counts(nearby_issues)
             
             logger.info(f"Found {len(nearby_issues)} issues within {radius_km}km")
             return nearby_issues
@@ -309,6 +749,44 @@ class FirestoreManager:
             logger.error(f"Failed to get nearby issues: {e}")
             return []
     
+    async def _is_geohash_backfilled(self) -> bool:
+        """Whether backfill.py has stored a geohash on every issue (remembered once true)"""
+        if not self._geohash_backfilled:
+            marker = await self._call(self.db.collection('migrations').document('geohash').get)
+            self._geohash_backfilled = marker.exists
+        return self._geohash_backfilled
+    
+    async def backfill_issue_geohashes(self) -> int:
+        """
+        Store a geohash on every issue with a location but no geohash
+        
+        Issues created before geohashes were stored are invisible to the
+        geohash range queries in get_nearby_issues. Marks the migration done
+        at migrations/geohash when finished. Returns the number of issues updated.
+        """
+        issues_query = self.db.collection('issues').select(['location', 'geohash'])
+        updates = []
+        for doc in await self._call(_fetch, issues_query):
+            issue_data = doc.to_dict()
+            geopoint = issue_data.get('location')
+            if geopoint and not issue_data.get('geohash'):
+                updates.append((doc.reference, pygeohash.encode(
+                    geopoint.latitude, geopoint.longitude, precision=GEOHASH_PRECISION
+                )))
+        
+        for start in range(0, len(updates), MAX_BATCH_SIZE):
+            batch = self.db.batch()
+            for ref, geohash in updates[start:start + MAX_BATCH_SIZE]:
+                batch.update(ref, {'geohash': geohash})
+            await self._call(batch.commit, retry=WRITE_RETRY)
+        
+        await self._call(
+            self.db.collection('migrations').document('geohash').set,
+            {'completedAt': datetime.utcnow()}, retry=WRITE_RETRY
+        )
+        self._geohash_backfilled = True
+        return len(updates)
+    
     async def update_issue(self, issue_id: str, update_data: Dict[str, Any]) -> bool:
         """Update issue document"""
         try:
@@ -319,8 +797,25 @@ class FirestoreManager:
                 latitude = float(update_data.pop('latitude'))
                 longitude = float(update_data.pop('longitude'))
                 update_data['location'] = GeoPoint(latitude, longitude)
-            
-            self.db.collection('issues').document(issue_id).update(update_data)
+                update_data['geohash'] = pygeohash.encode(latitude, longitude, precision=GEOHASH_PRECISION)
+            
+            doc_ref = self.db.collection('issues').document(issue_id)
+            batch = self.db.batch()
+            batch.update(doc_ref, update_data)
+            
+            # Move the issue between statistics counters if a counted field changes
+            author_id = None
+            if any(field in update_data for _, field, _ in _ISSUE_STATS_FIELDS):
+                current = await self._call(doc_ref.get)
+                if current.exists:
+                    current_data = current.to_dict()
+                    author_id = current_data.get('userId')
+                    delta = _issue_stats_change(current_data, update_data)
+                    if delta:
+                        batch.set(self._issue_stats_shard(), delta, merge=True)
+            
+            await self._call(batch.commit, retry=WRITE_RETRY)
+            await self._invalidate_user_aggregates(author_id)
             logger.info(f"Issue updated: {issue_id}")
             return True
             
@@ -331,16 +826,29 @@ class FirestoreManager:
     async def delete_issue(self, issue_id: str) -> bool:
         """Delete issue and related data"""
         try:
-            # Delete issue document
-            self.db.collection('issues').document(issue_id).delete()
-            
-            # Delete related votes
+            # Collect related votes
             votes_query = self.db.collection('votes').where(
                 filter=FieldFilter('issueId', '==', issue_id)
             )
+            issue_ref = self.db.collection('issues').document(issue_id)
+            issue_doc, vote_docs = await asyncio.gather(
+                self._call(issue_ref.get),
+                self._call(_fetch, votes_query)
+            )
+            
+            # Delete issue document, its votes and vote counter shards
+            refs = [issue_ref]
+            refs.extend(vote_doc.reference for vote_doc in vote_docs)
+            refs.extend(self._vote_counter_shard(issue_id, shard) for shard in range(VOTE_COUNTER_SHARDS))
+            await self._delete_refs(refs)
+            self._vote_counts_cache.pop(issue_id, None)
             
-            for vote_doc in votes_query.stream():
-                vote_doc.reference.delete()
+            if issue_doc.exists:
+                issue_data = issue_doc.to_dict()
+                await self._call(
+                    self._issue_stats_shard().set, _issue_stats_delta(issue_data, -1), merge=True
+                )
+                await self._invalidate_user_aggregates(issue_data.get('userId'))
             
             logger.info(f"Issue and related data deleted: {issue_id}")
             return True
@@ -352,18 +860,37 @@ class FirestoreManager:
     # ==================== Issue Updates/Comments ====================
     
     async def add_issue_update(self, issue_id: str, update_data: Dict[str, Any]) -> Optional[str]:
-        """Add an update/comment to an issue"""
+        """
+        Add an update/comment to an issue
+        
+        An update carrying a status also moves the issue itself to that status.
+        Everything is written in one batch commit.
+        """
         try:
-            update_data['createdAt'] = datetime.utcnow()
-            
-            # Add to subcollection
-            doc_ref = self.db.collection('issues').document(issue_id).collection('updates').document()
-            doc_ref.set(update_data)
-            
-            # Update the main issue's updatedAt timestamp
-            self.db.collection('issues').document(issue_id).update({
-                'updatedAt': datetime.utcnow()
-            })
+            now = datetime.utcnow()
+            update_data['createdAt'] = now
+            
+            # Add to subcollection and bump the main issue's updatedAt in one commit
+            issue_ref = self.db.collection('issues').document(issue_id)
+            doc_ref = issue_ref.collection('updates').document()
+            issue_update = {'updatedAt': now}
+            batch = self.db.batch()
+            batch.set(doc_ref, update_data)
+            
+            author_id = None
+            if update_data.get('status'):
+                issue_update['status'] = normalize_status(update_data['status'])
+                current = await self._call(issue_ref.get)
+                if current.exists:
+                    current_data = current.to_dict()
+                    author_id = current_data.get('userId')
+                    delta = _issue_stats_change(current_data, issue_update)
+                    if delta:
+                        batch.set(self._issue_stats_shard(), delta, merge=True)
+            
+            batch.update(issue_ref, issue_update)
+            await self._call(batch.commit, retry=WRITE_RETRY)
+            await self._invalidate_user_aggregates(author_id)
             
             logger.info(f"Update added to issue {issue_id}: {doc_ref.id}")
             return doc_ref.id
@@ -379,13 +906,8 @@ class FirestoreManager:
                 'createdAt', direction=Query.DESCENDING
             ).limit(limit)
             
-            updates = []
-            for doc in query.stream():
-                update_data = doc.to_dict()
-                update_data['id'] = doc.id
-                updates.append(update_data)
-            
-            return updates
+            docs = await self._single_flight(('issue_updates', f"{issue_id}:{limit}"), self._call, _fetch, query)
+            return [{**doc.to_dict(), 'id': doc.id} for doc in docs]
             
         except Exception as e:
             logger.error(f"Failed to get updates for issue {issue_id}: {e}")
@@ -399,16 +921,17 @@ class FirestoreManager:
             # Clean up old codes for this phone number
             await self._cleanup_old_verification_codes(phone_number)
             
+            now = datetime.utcnow()
             code_data = {
                 'phoneNumber': phone_number,
                 'code': code,
-                'expiresAt': datetime.utcnow() + timedelta(minutes=expires_minutes),
+                'expiresAt': now + timedelta(minutes=expires_minutes),
                 'verified': False,
-                'createdAt': datetime.utcnow()
+                'createdAt': now
             }
             
             doc_ref = self.db.collection('verification_codes').document()
-            doc_ref.set(code_data)
+            await self._call(doc_ref.set, code_data)
             
             logger.info(f"Verification code created for {phone_number}")
             return doc_ref.id
@@ -431,11 +954,11 @@ class FirestoreManager:
                 filter=FieldFilter('expiresAt', '>', datetime.utcnow())
             ).limit(1)
             
-            docs = list(query.stream())
+            docs = await self._call(_fetch, query)
             if docs:
                 # Mark as verified
                 doc = docs[0]
-                doc.reference.update({'verified': True})
+                await self._call(doc.reference.update, {'verified': True})
                 logger.info(f"Code verified for {phone_number}")
                 return True
             
@@ -453,14 +976,37 @@ class FirestoreManager:
                 filter=FieldFilter('phoneNumber', '==', phone_number)
             )
             
-            for doc in old_codes_query.stream():
-                doc.reference.delete()
+            old_codes = await self._call(_fetch, old_codes_query)
+            await self._delete_refs([doc.reference for doc in old_codes])
                 
         except Exception as e:
             logger.error(f"Failed to cleanup old codes for {phone_number}: {e}")
     
     # ==================== Voting System ====================
     
+    async def _find_vote(self, issue_id: str, user_id: str) -> Tuple[Any, Optional[Any], List[Any]]:
+        """
+        Look up a user's vote on an issue
+        
+        Votes are stored under the deterministic ID '{issue_id}_{user_id}'. Votes
+        cast before that have auto-generated IDs and can only be found by query,
+        so both lookups run concurrently. Returns (vote_ref, vote snapshot or None,
+        legacy vote snapshots).
+        """
+        vote_ref = self.db.collection('votes').document(f"{issue_id}_{user_id}")
+        legacy_query = self.db.collection('votes').where(
+            filter=FieldFilter('issueId', '==', issue_id)
+        ).where(
+            filter=FieldFilter('userId', '==', user_id)
+        ).limit(2)
+        
+        vote_doc, matches = await asyncio.gather(
+            self._call(vote_ref.get),
+            self._call(_fetch, legacy_query)
+        )
+        legacy_votes = [doc for doc in matches if doc.id != vote_ref.id]
+        return vote_ref, (vote_doc if vote_doc.exists else None), legacy_votes
+    
     async def vote_on_issue(self, issue_id: str, user_id: str, vote_type: str) -> bool:
         """Vote on an issue (upvote/downvote) with toggle functionality"""
         try:
@@ -470,39 +1016,54 @@ class FirestoreManager:
                 return False
             
             # Check for existing vote
-            existing_vote_query = self.db.collection('votes').where(
-                filter=FieldFilter('issueId', '==', issue_id)
-            ).where(
-                filter=FieldFilter('userId', '==', user_id)
-            ).limit(1)
+            vote_ref, vote_doc, legacy_votes = await self._find_vote(issue_id, user_id)
+            existing_vote = vote_doc or (legacy_votes[0] if legacy_votes else None)
+            previous_type = existing_vote.to_dict().get('voteType') if existing_vote else None
             
-            existing_votes = list(existing_vote_query.stream())
+            now = datetime.utcnow()
+            batch = self.db.batch()
+            # Legacy votes are moved to the deterministic ID (or just dropped when removing)
+            for legacy_vote in legacy_votes:
+                batch.delete(legacy_vote.reference)
             
-            if vote_type == 'remove' and existing_votes:
+            if vote_type == 'remove':
                 # Remove the vote
-                existing_votes[0].reference.delete()
-                logger.info(f"Vote removed: {user_id} -> {issue_id}")
-            elif existing_votes:
-                # Update existing vote
-                existing_vote = existing_votes[0]
-                existing_vote.reference.update({
-                    'voteType': vote_type,
-                    'updatedAt': datetime.utcnow()
-                })
-                logger.info(f"Vote updated: {user_id} -> {issue_id} ({vote_type})")
-            elif vote_type != 'remove':
-                # Create new vote (only if not removing)
-                vote_data = {
-                    'issueId': issue_id,
-                    'userId': user_id,
-                    'voteType': vote_type,
-                    'createdAt': datetime.utcnow()
-                }
-                self.db.collection('votes').document().set(vote_data)
-                logger.info(f"New vote created: {user_id} -> {issue_id} ({vote_type})")
-            
-            # Update issue vote counts
-            await self._update_issue_vote_count(issue_id)
+                if vote_doc:
+                    batch.delete(vote_ref)
+                new_type = None
+            else:
+                if existing_vote:
+                    # Update existing vote
+                    vote_data = existing_vote.to_dict()
+                    vote_data.update({'voteType': vote_type, 'updatedAt': now})
+                else:
+                    # Create new vote
+                    vote_data = {
+                        'issueId': issue_id,
+                        'userId': user_id,
+                        'voteType': vote_type,
+                        'createdAt': now
+                    }
+                batch.set(vote_ref, vote_data)
+                new_type = vote_type
+            
+            # Adjust a random vote counter shard in the same commit as the vote
+            # itself; the issue document isn't written, so it never gets hot
+            if previous_type != new_type:
+                upvote_delta = (new_type == 'upvote') - (previous_type == 'upvote')
+                downvote_delta = (new_type == 'downvote') - (previous_type == 'downvote')
+                shard_update = {'issueId': issue_id}
+                if upvote_delta:
+                    shard_update['upvotes'] = Increment(upvote_delta)
+                if downvote_delta:
+                    shard_update['downvotes'] = Increment(downvote_delta)
+                shard = random.randrange(VOTE_COUNTER_SHARDS)
+                batch.set(self._vote_counter_shard(issue_id, shard), shard_update, merge=True)
+            
+            await self._call(batch.commit, retry=WRITE_RETRY)
+            self._vote_counts_cache.pop(issue_id, None)
+            await self._invalidate_user_aggregates(user_id)
+            logger.info(f"Vote recorded: {user_id} -> {issue_id} ({previous_type} -> {new_type})")
             return True
             
         except Exception as e:
@@ -510,17 +1071,20 @@ class FirestoreManager:
             return False
     
     async def get_user_vote(self, issue_id: str, user_id: str) -> Optional[str]:
-        """Get user's vote on an issue"""
+        """Get user's vote on an issue (batched with concurrent lookups)"""
         try:
-            vote_query = self.db.collection('votes').where(
-                filter=FieldFilter('issueId', '==', issue_id)
-            ).where(
-                filter=FieldFilter('userId', '==', user_id)
-            ).limit(1)
-            
-            votes = list(vote_query.stream())
-            if votes:
-                vote_data = votes[0].to_dict()
+            key = (issue_id, user_id)
+            future = self._pending_votes.get(key)
+            if future is None:
+                loop = asyncio.get_running_loop()
+                future = loop.create_future()
+                if not self._pending_votes:
+                    loop.call_later(VOTE_BATCH_WINDOW_SECONDS, self._start_vote_flush)
+                self._pending_votes[key] = future
+            
+            existing_vote = await asyncio.shield(future)
+            if existing_vote:
+                vote_data = existing_vote.to_dict()
                 return vote_data.get('voteType')
             
             return None
@@ -529,40 +1093,84 @@ class FirestoreManager:
             logger.error(f"Failed to get user vote for issue {issue_id}: {e}")
             return None
     
-    async def _update_issue_vote_count(self, issue_id: str):
-        """Update vote counts for an issue"""
+    def _start_vote_flush(self):
+        """Run the pending vote lookups as one batch"""
+        self._vote_flush_task = asyncio.ensure_future(self._flush_vote_lookups())
+    
+    async def _flush_vote_lookups(self):
+        """Resolve all pending get_user_vote calls with one get_all plus grouped legacy queries"""
+        pending, self._pending_votes = self._pending_votes, {}
         try:
-            votes_query = self.db.collection('votes').where(
-                filter=FieldFilter('issueId', '==', issue_id)
+            docs = await self._get_documents(
+                'votes', [f"{issue_id}_{user_id}" for issue_id, user_id in pending]
             )
-            
-            upvotes = downvotes = 0
-            for vote_doc in votes_query.stream():
-                vote_data = vote_doc.to_dict()
-                if vote_data.get('voteType') == 'upvote':
-                    upvotes += 1
-                elif vote_data.get('voteType') == 'downvote':
-                    downvotes += 1
-            
-            # Use upvotes as the main vote count (positive only)
-            # Store both upvotes and downvotes for analytics, but display only upvotes
-            vote_count = upvotes  # Changed from net_votes to only upvotes
-            
-            # Update issue document
-            self.db.collection('issues').document(issue_id).update({
-                'voteCount': vote_count,
-                'upvotes': upvotes,
-                'downvotes': downvotes,
-                'updatedAt': datetime.utcnow()
-            })
-            
-            logger.info(f"Vote count updated for issue {issue_id}: +{upvotes}, -{downvotes}, display: {vote_count}")
-            
+            found = {}
+            missing_by_user = defaultdict(list)
+            for issue_id, user_id in pending:
+                doc = docs.get(f"{issue_id}_{user_id}")
+                if doc is not None:
+                    found[(issue_id, user_id)] = doc
+                else:
+                    missing_by_user[user_id].append(issue_id)
+            
+            # Votes cast before deterministic IDs, one query per user per chunk of issues
+            legacy_queries = [
+                self.db.collection('votes')
+                .where(filter=FieldFilter('userId', '==', user_id))
+                .where(filter=FieldFilter('issueId', 'in', issue_ids[start:start + MAX_IN_FILTER_VALUES]))
+                for user_id, issue_ids in missing_by_user.items()
+                for start in range(0, len(issue_ids), MAX_IN_FILTER_VALUES)
+            ]
+            results = await asyncio.gather(*(self._call(_fetch, query) for query in legacy_queries))
+            for doc in (doc for docs in results for doc in docs):
+                vote_data = doc.to_dict()
+                found.setdefault((vote_data.get('issueId'), vote_data.get('userId')), doc)
+            
+            for key, future in pending.items():
+                if not future.done():
+                    future.set_result(found.get(key))
         except Exception as e:
-            logger.error(f"Failed to update vote count for issue {issue_id}: {e}")
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
     
     # ==================== Analytics and Statistics ====================
     
+    async def _count_issue_statistics(self) -> Tuple[int, Counter, Counter, Counter]:
+        """Issue total and per-status/category/priority counts from a scan of the counted fields"""
+        issues_query = self.db.collection('issues').select([field for _, field, _ in _ISSUE_STATS_FIELDS])
+        statuses, categories, priorities = Counter(), Counter(), Counter()
+        total = 0
+        for doc in await self._call(_fetch, issues_query):
+            issue_data = doc.to_dict()
+            total += 1
+            for counts, (_, field, default) in zip((statuses, categories, priorities), _ISSUE_STATS_FIELDS):
+                counts[issue_data.get(field, default)] += 1
+        return total, statuses, categories, priorities
+    
+    async def seed_issue_statistics(self) -> int:
+        """
+        Recount all issues into the statistics counter shards
+        
+        Writes the counts to shard 0, zeroes the other shards and marks the
+        counters as seeded, in one batch. Run once on a database that has
+        issues from before the counters existed (see backfill.py), ideally
+        while no issues are being written. Returns the number of issues counted.
+        """
+        total, statuses, categories, priorities = await self._count_issue_statistics()
+        batch = self.db.batch()
+        batch.set(self._issue_stats_shard(0), {
+            'total': total,
+            'statuses': dict(statuses),
+            'categories': dict(categories),
+            'priorities': dict(priorities),
+        })
+        for shard in range(1, ISSUE_STATS_SHARDS):
+            batch.set(self._issue_stats_shard(shard), {'total': 0})
+        batch.set(self.db.collection('stats').document('issues'), {'seededAt': datetime.utcnow()}, merge=True)
+        await self._call(batch.commit, retry=WRITE_RETRY)
+        return total
+    
     async def get_issue_statistics(self) -> Dict[str, Any]:
         """Get overall issue statistics"""
         try:
@@ -574,28 +1182,37 @@ class FirestoreManager:
                 'priorities': {}
             }
             
-            # Get all issues (you might want to limit this for large datasets)
-            issues_query = self.db.collection('issues')
-            
-            for doc in issues_query.stream():
-                issue_data = doc.to_dict()
-                
-                stats['total_issues'] += 1
-                
-                status = issue_data.get('status', 'open')
-                if status == 'open':
-                    stats['open_issues'] += 1
-                elif status in ['resolved', 'closed']:
-                    stats['resolved_issues'] += 1
-                
-                # Category stats
-                category = issue_data.get('category', 'General')
-                stats['categories'][category] = stats['categories'].get(category, 0) + 1
-                
-                # Priority stats
-                priority = issue_data.get('priority', 'medium')
-                stats['priorities'][priority] = stats['priorities'].get(priority, 0) + 1
-            
+            # Sum the counter shards maintained on issue writes, once they have
+            # been seeded with the issues that predate them
+            stats_doc = self.db.collection('stats').document('issues')
+            marker, shard_docs = await asyncio.gather(
+                self._call(stats_doc.get),
+                self._call(_fetch, stats_doc.collection('shards'))
+            )
+            if marker.exists and marker.get('seededAt'):
+                total = 0
+                statuses, categories, priorities = Counter(), Counter(), Counter()
+                for doc in shard_docs:
+                    shard = doc.to_dict()
+                    total += shard.get('total', 0)
+                    statuses.update(shard.get('statuses', {}))
+                    categories.update(shard.get('categories', {}))
+                    priorities.update(shard.get('priorities', {}))
+            else:
+                total, statuses, categories, priorities = await self._count_issue_statistics()
+            
+            # Counters never go below zero, even if a write raced the seeding
+            statuses, categories, priorities = (
+                {key: max(value, 0) for key, value in counts.items()}
+                for counts in (statuses, categories, priorities)
+            )
+            stats['total_issues'] = max(total, 0)
+            stats['resolved_issues'] = min(
+                sum(statuses.get(status, 0) for status in _RESOLVED_STATUSES), stats['total_issues']
+            )
+            stats['open_issues'] = stats['total_issues'] - stats['resolved_issues']
+            stats['categories'] = categories
+            stats['priorities'] = priorities
             return stats
             
         except Exception as e:
@@ -603,7 +1220,37 @@ class FirestoreManager:
             return {}
     
     async def get_user_statistics(self, user_id: str) -> Dict[str, Any]:
-        """Get statistics for a specific user"""
+        """Get statistics for a specific user, cached briefly in process and for longer in Redis"""
+        stats = self._stats_cache.get(user_id)
+        if stats is None:
+            stats = await self._single_flight(('userstats', user_id), self._load_user_statistics, user_id)
+        return copy.deepcopy(stats)
+    
+    async def _load_user_statistics(self, user_id: str) -> Dict[str, Any]:
+        """Fill the statistics cache for a user from Redis, or from Firestore on a miss"""
+        redis_key = f"userstats:{user_id}"
+        if self._redis is not None:
+            try:
+                cached = await self._redis.get(redis_key)
+                if cached is not None:
+                    stats = json.loads(cached)
+                    self._stats_cache[user_id] = stats
+                    return stats
+            except Exception as e:
+                logger.warning(f"Redis unavailable for cached statistics: {e}")
+        
+        stats = await self._compute_user_statistics(user_id)
+        if stats:
+            self._stats_cache[user_id] = stats
+            if self._redis is not None:
+                try:
+                    await self._redis.set(redis_key, json.dumps(stats), ex=USER_STATS_CACHE_TTL_SECONDS)
+                except Exception as e:
+                    logger.warning(f"Redis unavailable for cached statistics: {e}")
+        return stats
+    
+    async def _compute_user_statistics(self, user_id: str) -> Dict[str, Any]:
+        """Compute statistics for a specific user from Firestore"""
         try:
             stats = {
                 'issues_reported': 0,
@@ -612,27 +1259,25 @@ class FirestoreManager:
                 'issues_by_category': {}
             }
             
-            # Count user's issues
-            user_issues_query = self.db.collection('issues').where(
+            # The user's issues (status and category only) and a server-side
+            # count of their votes are independent, so fetch them together
+            user_issues_query = self.db.collection('issues').select(['status', 'category']).where(
                 filter=FieldFilter('userId', '==', user_id)
             )
-            
-            for doc in user_issues_query.stream():
-                issue_data = doc.to_dict()
-                stats['issues_reported'] += 1
-                
-                status = issue_data.get('status', 'open')
-                stats['issues_by_status'][status] = stats['issues_by_status'].get(status, 0) + 1
-                
-                category = issue_data.get('category', 'General')
-                stats['issues_by_category'][category] = stats['issues_by_category'].get(category, 0) + 1
-            
-            # Count user's votes
-            user_votes_query = self.db.collection('votes').where(
+            user_votes_count = self.db.collection('votes').where(
                 filter=FieldFilter('userId', '==', user_id)
+            ).count()
+            
+            issue_snapshots, votes_result = await asyncio.gather(
+                self._call(_fetch, user_issues_query),
+                self._call(user_votes_count.get)
             )
             
-            stats['votes_cast'] = len(list(user_votes_query.stream()))
+            issue_docs = [doc.to_dict() for doc in issue_snapshots]
+            stats['issues_reported'] = len(issue_docs)
+            stats['issues_by_status'] = dict(Counter(issue.get('status', 'open') for issue in issue_docs))
+            stats['issues_by_category'] = dict(Counter(issue.get('category', 'General') for issue in issue_docs))
+            stats['votes_cast'] = votes_result[0][0].value
             
             return stats
             
@@ -671,7 +1316,7 @@ class FirestoreManager:
         try:
             # Try to read from a collection
             test_query = self.db.collection('users').limit(1)
-            list(test_query.stream())
+            await self._call(_fetch, test_query)
             
             return {
                 'firestore': 'healthy',
@@ -688,79 +1333,103 @@ class FirestoreManager:
 
 # Global database manager instance (will be initialized lazily)
 db_manager = None
+_db_manager_lock = threading.Lock()
 
 def get_db_manager():
     """Get or create the global database manager instance"""
     global db_manager
     if db_manager is None:
-        db_manager = FirestoreManager()
+        with _db_manager_lock:
+            if db_manager is None:
+                db_manager = FirestoreManager()
     return db_manager
 
+async def close_db_manager():
+    """Release the global manager's connections, if it was ever created (for app shutdown)"""
+    global db_manager
+    with _db_manager_lock:
+        manager, db_manager = db_manager, None
+    if manager is not None:
+        await manager.close()
+
 # Convenience functions for easy import
+# (db_manager is read directly once created, skipping the get_db_manager() call)
 async def create_user(user_data: Dict[str, Any]) -> Optional[str]:
     """Create a new user"""
-    return await get_db_manager().create_user(user_data)
+    return await (db_manager or get_db_manager()).create_user(user_data)
 
 async def get_user(user_id: str) -> Optional[Dict[str, Any]]:
     """Get user by ID"""
-    return await get_db_manager().get_user(user_id)
+    return await (db_manager or get_db_manager()).get_user(user_id)
+
+async def get_users_by_ids(user_ids: List[str]) -> List[Dict[str, Any]]:
+    """Get several users by ID in one round-trip"""
+    return await (db_manager or get_db_manager()).get_users_by_ids(user_ids)
 
 async def get_user_by_phone(phone_number: str) -> Optional[Dict[str, Any]]:
     """Get user by phone number"""
-    return await get_db_manager().get_user_by_phone(phone_number)
+    return await (db_manager or get_db_manager()).get_user_by_phone(phone_number)
 
 async def create_issue(issue_data: Dict[str, Any]) -> Optional[str]:
     """Create a new issue"""
-    return await get_db_manager().create_issue(issue_data)
+    return await (db_manager or get_db_manager()).create_issue(issue_data)
 
 async def get_issue(issue_id: str) -> Optional[Dict[str, Any]]:
     """Get issue by ID"""
-    return await get_db_manager().get_issue(issue_id)
+    return await (db_manager or get_db_manager()).get_issue(issue_id)
+
+async def get_issues_by_ids(issue_ids: List[str]) -> List[Dict[str, Any]]:
+    """Get several issues by ID in one round-trip"""
+    return await (db_manager or get_db_manager()).get_issues_by_ids(issue_ids)
 
 async def get_issues(limit: int = 50, **filters) -> List[Dict[str, Any]]:
     """Get issues with filters"""
-    return await get_db_manager().get_issues(limit=limit, **filters)
+    return await (db_manager or get_db_manager()).get_issues(limit=limit, **filters)
+
+async def count_issues(**filters) -> int:
+    """Count issues matching filters"""
+    return await (db_manager or get_db_manager()).count_issues(**filters)
 
 async def get_nearby_issues(latitude: float, longitude: float, radius_km: float = 10.0, limit: int = 50) -> List[Dict[str, Any]]:
     """Get issues near a location"""
-    return await get_db_manager().get_nearby_issues(latitude, longitude, radius_km, limit)
+    return await (db_manager or get_db_manager()).get_nearby_issues(latitude, longitude, radius_km, limit)
 
 async def vote_on_issue(issue_id: str, user_id: str, vote_type: str) -> bool:
     """Vote on an issue"""
-    return await get_db_manager().vote_on_issue(issue_id, user_id, vote_type)
+    return await (db_manager or get_db_manager()).vote_on_issue(issue_id, user_id, vote_type)
 
 async def create_verification_code(phone_number: str, code: str, expires_minutes: int = 10) -> Optional[str]:
     """Create verification code"""
-    return await get_db_manager().create_verification_code(phone_number, code, expires_minutes)
+    return await (db_manager or get_db_manager()).create_verification_code(phone_number, code, expires_minutes)
 
 async def verify_code(phone_number: str, code: str) -> bool:
     """Verify a code"""
-    return await get_db_manager().verify_code(phone_number, code)
+    return await (db_manager or get_db_manager()).verify_code(phone_number, code)
 
-async def get_user_issues(user_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+async def get_user_issues(user_id: str, limit: int = 50, status: str = None) -> List[Dict[str, Any]]:
     """Get issues created by a specific user"""
-    return await get_db_manager().get_user_issues(user_id, limit)
+    return await (db_manager or get_db_manager()).get_user_issues(user_id, limit, status)
 
 async def update_issue(issue_id: str, update_data: Dict[str, Any]) -> bool:
     """Update issue data"""
-    return await get_db_manager().update_issue(issue_id, update_data)
+    return await (db_manager or get_db_manager()).update_issue(issue_id, update_data)
 
 async def get_user_vote(issue_id: str, user_id: str) -> Optional[str]:
     """Get user's vote on an issue"""
-    return await get_db_manager().get_user_vote(issue_id, user_id)
+    return await (db_manager or get_db_manager()).get_user_vote(issue_id, user_id)
 
 async def update_user(user_id: str, update_data: Dict[str, Any]) -> bool:
     """Update user data"""
-    return await get_db_manager().update_user(user_id, update_data)
+    return await (db_manager or get_db_manager()).update_user(user_id, update_data)
 
 async def add_issue_update(issue_id: str, update_data: Dict[str, Any]) -> bool:
     """Add an update to an issue"""
-    return await get_db_manager().add_issue_update(issue_id, update_data)
+    return await (db_manager or get_db_manager()).add_issue_update(issue_id, update_data)
 
 async def get_issue_updates(issue_id: str) -> List[Dict[str, Any]]:
     """Get all updates for an issue"""
-    return await get_db_manager().get_issue_updates(issue_id)
+    return await (db_manager or get_db_manager()).get_issue_updates(issue_id)
 
 async def get_user_statistics(user_id: str) -> Dict[str, Any]:
     """Get user statistics including issues created, votes cast, etc."""
-    return await get_db_manager().get_user_statistics(user_id)
\ No newline at end of file
+    return await (db_manager or get_db_manager()).get_user_statistics(user_id)
\ No newline at end of file
@@ -0,0 +1,40 @@
+"""
+HTTP caching helpers for Meri Awaaz
+Weak ETags from document timestamps, and 304 replies to conditional GETs
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+# Per-user data: browsers may reuse it briefly, shared caches must not store it
+PRIVATE_CACHE_CONTROL = "private, max-age=30, stale-while-revalidate=60"
+
+def weak_etag(*parts) -> str:
+    """Weak ETag from a document's ID and version (e.g. its updatedAt timestamp)"""
+    return 'W/"' + ':'.join(str(part) for part in parts) + '"'
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    opaque_tag = etag.removeprefix('W/')
+    return any(tag.strip().removeprefix('W/') == opaque_tag for tag in if_none_match.split(','))
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Attach caching headers for etag to the outgoing response
+
+    Returns a 304 response to send instead when the client's If-None-Match
+    already names this version, so the body doesn't have to be built.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": PRIVATE_CACHE_CONTROL,
+        "Vary": "Authorization",
+    }
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
@@ -2,100 +2,12 @@
 Main FastAPI application instance and router configuration
 Updated to use Firestore database instead of PostgreSQL
 """
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 import os
-from dotenv import load_dotenv
+import sys
 
-# Load environment variables first
-load_dotenv()
+from app_factory import create_app
 
-# Import routers (Firestore will initialize when imported)
-from routers import users, issues, verification, ai_agents_working as ai_agents
-
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Application lifespan manager for startup and shutdown events"""
-    # Startup
-    try:
-        print("✅ Firestore database ready for connections")
-    except Exception as e:
-        print(f"❌ Application startup error: {e}")
-        # Don't raise here to allow the app to start in degraded mode
-    
-    yield
-    
-    # Shutdown
-    print("🔄 Application shutting down")
-
-app = FastAPI(
-    title="Meri Awaaz API",
-    description="Civic Voice Platform Backend API",
-    version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    lifespan=lifespan
-)
-
-# Configure CORS - Allow frontend development server and production origins
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173", 
-        "http://localhost:3000", 
-        "http://localhost:3002",  # Admin dashboard
-        "http://localhost:5174",
-        "http://localhost:8080",  # Vite dev server alternate port
-        "http://127.0.0.1:5173",
-        "http://127.0.0.1:3002",  # Admin dashboard
-        "http://127.0.0.1:8080", 
-        "https://localhost:5173",  # HTTPS versions
-        "https://localhost:3002",  # Admin dashboard HTTPS
-        "https://localhost:8080",
-        "https://meri-awaaz.vercel.app",  # Production domain
-        "https://*.vercel.app",  # All Vercel deployments
-        "https://*.ngrok-free.app",  # Ngrok free tier
-        "https://*.ngrok.io",  # Ngrok tunnels
-        "https://*.ngrok.app",  # Ngrok app domains
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(users.router, prefix="/api", tags=["users"])
-app.include_router(issues.router, prefix="/api", tags=["issues"])
-app.include_router(verification.router, prefix="/api", tags=["verification"])
-app.include_router(ai_agents.router, prefix="/api", tags=["ai-agents", "admin"])
-
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy", "message": "Meri Awaaz API is running"}
-
-# Test endpoint
-@app.get("/")
-async def root():
-    return {
-        "message": "Welcome to Meri Awaaz API",
-        "version": "1.0.0",
-        "status": "running"
-    }
-
-# Global exception handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    return JSONResponse(
-        status_code=500,
-        content={
-            "success": False,
-            "message": "Internal server error",
-            "data": None
-        }
-    )
+app = create_app()
 
 if __name__ == "__main__":
     import uvicorn
@@ -110,11 +22,33 @@ if __name__ == "__main__":
     print(f"📝 Environment: {'development' if is_development else 'production'}")
     print(f"📊 Docs available at: http://localhost:{port}/docs")
     
+    # Production: the C event loop and HTTP parser (both ship with
+    # uvicorn[standard], except uvloop on Windows), one process per core when
+    # Redis shares caches and processing jobs between them - otherwise each
+    # worker has its own, so default to a single worker
+    server_options = {}
+    if not is_development:
+        shared_state = bool(os.getenv("REDIS_URL"))
+        workers = int(os.getenv("WEB_CONCURRENCY", (os.cpu_count() or 1) if shared_state else 1))
+        if workers > 1 and not shared_state:
+            print(f"⚠️  {workers} workers without REDIS_URL: caches and processing jobs are per worker")
+        server_options["workers"] = workers
+        # Workers inherit the environment; ai_agents checks it before handing out pollable jobs
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        server_options["http"] = "httptools"
+        if sys.platform != "win32":
+            server_options["loop"] = "uvloop"
+        # Shed load with 503s past this many in-flight requests per worker,
+        # and let idle keep-alive connections (the dashboards poll) live a while
+        server_options["limit_concurrency"] = int(os.getenv("LIMIT_CONCURRENCY", 1000))
+        server_options["timeout_keep_alive"] = 30
+    
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=port,
         reload=is_development,
         access_log=is_development,
-        log_level="info" if is_development else "warning"
+        log_level="info" if is_development else "warning",
+        **server_options
     )
\ No newline at end of file
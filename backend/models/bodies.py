@@ -0,0 +1,70 @@
+"""
+msgspec request bodies for the write endpoints
+Decoded straight from the raw JSON by decoders built once at import time;
+the Pydantic models in schemas.py still describe these bodies in the OpenAPI docs
+"""
+from typing import Any, Callable, Dict, List, Optional, Type
+
+import msgspec
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel
+
+class LocationBody(msgspec.Struct):
+    latitude: float
+    longitude: float
+    address: Optional[str] = None
+
+class IssueCreateBody(msgspec.Struct):
+    title: str
+    description: str
+    category: str  # Will be mapped to IssueCategory
+    priority: str  # Will be mapped to IssuePriority
+    location: LocationBody
+    imageUrls: Optional[List[str]] = []
+    audioUrl: Optional[str] = None
+
+class UserProfileUpdateBody(msgspec.Struct):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    avatar: Optional[str] = None
+    aadhaarNumber: Optional[str] = None
+    address: Optional[str] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    pincode: Optional[str] = None
+    occupation: Optional[str] = None
+    dateOfBirth: Optional[str] = None
+
+def json_body(struct_type: Type[msgspec.Struct]) -> Callable:
+    """Dependency decoding the request's JSON body into struct_type, 422 if it doesn't fit"""
+    decoder = msgspec.json.Decoder(struct_type)
+
+    async def decode(request: Request) -> Any:
+        try:
+            return decoder.decode(await request.body())
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+
+    return decode
+
+def _inline_refs(schema: Any, defs: Dict[str, Any]) -> Any:
+    """JSON schema with local $defs references replaced by the definitions themselves"""
+    if isinstance(schema, dict):
+        if '$ref' in schema:
+            return _inline_refs(defs[schema['$ref'].rsplit('/', 1)[-1]], defs)
+        return {key: _inline_refs(value, defs) for key, value in schema.items()}
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+    return schema
+
+def openapi_body(model: Type[BaseModel]) -> Dict[str, Any]:
+    """openapi_extra documenting a required JSON body shaped like model"""
+    schema = model.model_json_schema()
+    schema = _inline_refs(schema, schema.pop('$defs', {}))
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": schema}},
+        }
+    }
@@ -1,11 +1,14 @@
 """
 Pydantic models mirroring the TypeScript interfaces
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
 from datetime import datetime
 from enum import Enum
 
+# Models that are only built and serialized, never modified after validation
+_RESPONSE_CONFIG = ConfigDict(frozen=True)
+
 # Enums matching TypeScript types
 class IssueStatus(str, Enum):
     SUBMITTED = "Submitted"
@@ -28,14 +31,56 @@ class IssuePriority(str, Enum):
     MEDIUM = "Medium"
     LOW = "Low"
 
+# Stored/legacy value (lowercased) -> enum, for decoding Firestore documents
+_STATUS_BY_VALUE = {
+    **{status.value.lower(): status for status in IssueStatus},
+    'pending': IssueStatus.SUBMITTED,
+    'open': IssueStatus.SUBMITTED,
+    'in-progress': IssueStatus.IN_PROGRESS,
+    'rejected': IssueStatus.RESOLVED,  # Map rejected to resolved for now
+}
+
+_CATEGORY_BY_VALUE = {
+    **{category.value.lower(): category for category in IssueCategory},
+    'public-works': IssueCategory.PUBLIC_WORKS,
+    'public_works': IssueCategory.PUBLIC_WORKS,
+}
+
+_PRIORITY_BY_VALUE = {
+    **{priority.value.lower(): priority for priority in IssuePriority},
+    'urgent': IssuePriority.CRITICAL,
+}
+
+def parse_status(value) -> IssueStatus:
+    """Stored status (current or legacy, any case) as an IssueStatus, Submitted if unknown"""
+    if not isinstance(value, str):
+        return IssueStatus.SUBMITTED
+    return _STATUS_BY_VALUE.get(value.strip().lower(), IssueStatus.SUBMITTED)
+
+def parse_category(value) -> IssueCategory:
+    """Stored category (current or legacy, any case) as an IssueCategory, General if unknown"""
+    if not isinstance(value, str):
+        return IssueCategory.GENERAL
+    return _CATEGORY_BY_VALUE.get(value.strip().lower(), IssueCategory.GENERAL)
+
+def parse_priority(value) -> IssuePriority:
+    """Stored priority (current or legacy, any case) as an IssuePriority, Medium if unknown"""
+    if not isinstance(value, str):
+        return IssuePriority.MEDIUM
+    return _PRIORITY_BY_VALUE.get(value.strip().lower(), IssuePriority.MEDIUM)
+
 # Location schema
 class Location(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     latitude: float
     longitude: float
     address: Optional[str] = None
 
 # User Profile schema - exact match to TypeScript interface
 class UserProfile(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     userId: str
     name: str
     email: str
@@ -68,6 +113,8 @@ class UserProfileUpdate(BaseModel):
 
 # Issue schema - exact match to TypeScript interface
 class Issue(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     issueId: str
     authorId: str
     authorName: str  # Denormalized for easy display
@@ -109,6 +156,8 @@ class ApiResponse(BaseModel):
     message: Optional[str] = None
 
 class PaginationInfo(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     page: int
     limit: int
     total: int
@@ -123,6 +172,8 @@ class PaginatedResponse(BaseModel):
 
 # User stats schema
 class UserStats(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     issuesReported: int
     issuesResolved: int
     totalVotes: int
@@ -130,5 +181,7 @@ class UserStats(BaseModel):
 
 # File upload response
 class FileUploadResponse(BaseModel):
+    model_config = _RESPONSE_CONFIG
+
     imageUrl: Optional[str] = None
     audioUrl: Optional[str] = None
\ No newline at end of file
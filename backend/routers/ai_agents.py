@@ -2,17 +2,122 @@
 AI Agents Router - Administrative endpoints for AI agent management
 Handles AI agent status, activities, configuration, and monitoring
 """
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from collections import Counter, deque
+from itertools import count, islice
+import os
 import json
+import uuid
 import asyncio
+import logging
+import orjson
+from cachetools import LRUCache, TTLCache
 from pydantic import BaseModel
 
 from models.schemas import ApiResponse
-from core.auth import verify_admin_token, DEMO_ADMIN_CREDENTIALS
+from core.auth import verify_admin_token, demo_login
 
-router = APIRouter()
+# Redis shares cached dashboard responses between workers - optional, falls back to in-process only
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Everything but login requires an admin token, checked once at the router level.
+# orjson is the default here even when mounted on an app without it.
+router = APIRouter(default_response_class=ORJSONResponse)
+admin_router = APIRouter(default_response_class=ORJSONResponse, dependencies=[Depends(verify_admin_token)])
+
+# Serialized responses of the read-mostly GET endpoints, per namespace. Keys
+# never include the admin token: the data is the same for every admin.
+# Agents and activities only change through this module's handlers, which
+# invalidate them, so they are kept until then rather than expiring.
+_RESPONSE_CACHES = {
+    "agents": LRUCache(maxsize=1),
+    "activities": LRUCache(maxsize=256),
+    "agent_stats": TTLCache(maxsize=1, ttl=60),
+    "admin_stats": TTLCache(maxsize=1, ttl=300),
+}
+# Agent data is mutated per process, so only the static dashboard stats go to Redis (namespace -> TTL)
+_SHARED_RESPONSE_TTLS = {"admin_stats": 300}
+
+# Manual processing jobs by job_id, kept for polling; only recent ones are retained.
+# With Redis they are shared, so a poll can land on any worker; without it,
+# polling only finds jobs started on the same process.
+_PROCESSING_JOBS = LRUCache(maxsize=256)
+PROCESSING_JOB_TTL_SECONDS = 3600
+
+_redis_url = os.getenv('REDIS_URL')
+_redis = aioredis.from_url(_redis_url) if REDIS_AVAILABLE and _redis_url else None
+
+# Jobs can be polled only if every worker sees them; otherwise process-issue
+# finishes the job before responding (main.py exports the worker count)
+_JOBS_POLLABLE = _redis is not None or int(os.getenv("WEB_CONCURRENCY", 1)) <= 1
+
+def _api_response(message: str, data: Any, status_code: int = 200) -> ORJSONResponse:
+    """
+    Successful ApiResponse-shaped reply, serialized straight to JSON by orjson
+
+    Skips response model validation and jsonable_encoder; orjson writes
+    datetimes as ISO 8601 itself.
+    """
+    return ORJSONResponse({"success": True, "message": message, "data": data}, status_code=status_code)
+
+async def _cached_response(namespace: str, key: str) -> Optional[Response]:
+    """A still-fresh cached response for namespace/key, from memory or Redis"""
+    body = _RESPONSE_CACHES[namespace].get(key)
+    if body is None and namespace in _SHARED_RESPONSE_TTLS and _redis is not None:
+        try:
+            body = await _redis.get(f"admin:{namespace}:{key}")
+        except Exception as e:
+            logger.warning(f"Failed to read cached {namespace} response: {e}")
+        if body is not None:
+            _RESPONSE_CACHES[namespace][key] = body
+    return Response(body, media_type="application/json") if body is not None else None
+
+async def _cache_response(namespace: str, key: str, message: str, data: Any) -> Response:
+    """Reply like _api_response, keeping the serialized body for _cached_response"""
+    body = orjson.dumps({"success": True, "message": message, "data": data})
+    _RESPONSE_CACHES[namespace][key] = body
+    if namespace in _SHARED_RESPONSE_TTLS and _redis is not None:
+        try:
+            await _redis.set(f"admin:{namespace}:{key}", body, ex=_SHARED_RESPONSE_TTLS[namespace])
+        except Exception as e:
+            logger.warning(f"Failed to cache {namespace} response: {e}")
+    return Response(body, media_type="application/json")
+
+async def _save_job(job: Dict[str, Any]):
+    """Record a processing job's current state, locally and in Redis when available"""
+    _PROCESSING_JOBS[job["job_id"]] = job
+    if _redis is not None:
+        try:
+            await _redis.set(f"admin:job:{job['job_id']}", orjson.dumps(job), ex=PROCESSING_JOB_TTL_SECONDS)
+        except Exception as e:
+            logger.warning(f"Failed to share processing job {job['job_id']}: {e}")
+
+async def _load_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """A processing job by ID, from this worker or, failing that, Redis"""
+    job = _PROCESSING_JOBS.get(job_id)
+    if job is None and _redis is not None:
+        try:
+            body = await _redis.get(f"admin:job:{job_id}")
+        except Exception as e:
+            logger.warning(f"Failed to read processing job {job_id}: {e}")
+            body = None
+        if body is not None:
+            job = orjson.loads(body)
+    return job
+
+def _invalidate_responses(*namespaces: str):
+    """Drop cached responses built from agent data that just changed"""
+    for namespace in namespaces:
+        _RESPONSE_CACHES[namespace].clear()
 
 # AI Agent Models
 class AIAgentStatus(BaseModel):
@@ -100,7 +205,13 @@ MOCK_AI_AGENTS = [
     }
 ]
 
-MOCK_AI_ACTIVITIES = [
+# agent_id -> agent dict (the same dicts as MOCK_AI_AGENTS, which never grows)
+_AGENTS_BY_ID = {agent["agent_id"]: agent for agent in MOCK_AI_AGENTS}
+
+# Most recent activities kept; older ones drop off the end
+MAX_AI_ACTIVITIES = 500
+
+MOCK_AI_ACTIVITIES = deque([
     {
         "id": "act-001",
         "agent_id": "classification-agent",
@@ -156,591 +267,645 @@ MOCK_AI_ACTIVITIES = [
         "timestamp": datetime.now() - timedelta(minutes=25),
         "status": "failed"
     }
-]
+], maxlen=MAX_AI_ACTIVITIES)
 
-@router.get("/admin/ai-agents", response_model=ApiResponse)
-async def get_ai_agents(
-    admin_user=Depends(verify_admin_token)
-):
+# Running totals over MOCK_AI_ACTIVITIES, so stats don't rescan it
+_activity_totals = {"count": 0, "confidence_sum": 0.0, "success": 0}
+_activities_per_day = Counter()
+
+def _count_activity(activity: Dict[str, Any], step: int):
+    """Add (step=1) or remove (step=-1) an activity from the running totals"""
+    _activity_totals["count"] += step
+    _activity_totals["confidence_sum"] += step * activity["confidence"]
+    _activity_totals["success"] += step * (activity["status"] == "success")
+    day = activity["timestamp"].date()
+    _activities_per_day[day] += step
+    if _activities_per_day[day] <= 0:
+        del _activities_per_day[day]
+
+# agent_id -> that agent's entries of MOCK_AI_ACTIVITIES, newest first
+_ACTIVITIES_BY_AGENT: Dict[str, deque] = {}
+
+for _activity in MOCK_AI_ACTIVITIES:
+    _count_activity(_activity, 1)
+    _ACTIVITIES_BY_AGENT.setdefault(_activity["agent_id"], deque()).append(_activity)
+
+# Activity IDs: a per-process prefix plus a sequence number, unique without reading the clock
+_ACTIVITY_ID_PREFIX = uuid.uuid4().hex[:8]
+_activity_seq = count(1)
+
+def _activity_id(kind: str) -> str:
+    """New unique activity ID, e.g. 'restart-1a2b3c4d-17'"""
+    return f"{kind}-{_ACTIVITY_ID_PREFIX}-{next(_activity_seq)}"
+
+def _push_activity(activity: Dict[str, Any]):
+    """Record a new activity as the most recent one"""
+    if len(MOCK_AI_ACTIVITIES) == MOCK_AI_ACTIVITIES.maxlen:
+        # The oldest activity is about to be evicted; it's also its agent's oldest
+        evicted = MOCK_AI_ACTIVITIES[-1]
+        _count_activity(evicted, -1)
+        _ACTIVITIES_BY_AGENT[evicted["agent_id"]].pop()
+    MOCK_AI_ACTIVITIES.appendleft(activity)
+    _count_activity(activity, 1)
+    _ACTIVITIES_BY_AGENT.setdefault(activity["agent_id"], deque()).appendleft(activity)
+
+# Agent list served from serialized bytes from the first request on
+_RESPONSE_CACHES["agents"]["all"] = orjson.dumps(
+    {"success": True, "message": "AI agents retrieved successfully", "data": MOCK_AI_AGENTS}
+)
+
+@admin_router.get("/admin/ai-agents", response_model=ApiResponse)
+async def get_ai_agents():
     """Get all AI agents with their current status"""
-    try:
-        # Convert datetime objects to ISO format strings for JSON serialization
-        agents_data = []
-        for agent in MOCK_AI_AGENTS:
-            agent_copy = agent.copy()
-            agent_copy["last_activity"] = agent_copy["last_activity"].isoformat()
-            agents_data.append(agent_copy)
-            
-        return ApiResponse(
-            success=True,
-            message="AI agents retrieved successfully",
-            data=agents_data
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve AI agents: {str(e)}")
+    cached = await _cached_response("agents", "all")
+    if cached:
+        return cached
+    
+    return await _cache_response(
+        "agents", "all",
+        message="AI agents retrieved successfully",
+        data=MOCK_AI_AGENTS
+    )
 
-@router.get("/admin/ai-agents/activities", response_model=ApiResponse)
+@admin_router.get("/admin/ai-agents/activities", response_model=ApiResponse)
 async def get_ai_agent_activities(
     limit: int = Query(20, description="Number of activities to retrieve"),
-    agent_id: Optional[str] = Query(None, description="Filter by specific agent ID"),
-    admin_user=Depends(verify_admin_token)
+    agent_id: Optional[str] = Query(None, description="Filter by specific agent ID")
 ):
     """Get recent AI agent activities"""
-    try:
-        activities = MOCK_AI_ACTIVITIES.copy()
-        
-        # Filter by agent_id if provided
-        if agent_id:
-            activities = [a for a in activities if a["agent_id"] == agent_id]
-        
-        # Limit results
-        activities = activities[:limit]
-        
-        # Convert datetime objects to ISO format strings
-        activities_data = []
-        for activity in activities:
-            activity_copy = activity.copy()
-            activity_copy["timestamp"] = activity_copy["timestamp"].isoformat()
-            activities_data.append(activity_copy)
-        
-        return ApiResponse(
-            success=True,
-            message="AI agent activities retrieved successfully",
-            data=activities_data
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve AI activities: {str(e)}")
+    cache_key = f"{limit}:{agent_id or ''}"
+    cached = await _cached_response("activities", cache_key)
+    if cached:
+        return cached
+    
+    activities = MOCK_AI_ACTIVITIES
+    
+    # Filter by agent_id if provided
+    if agent_id:
+        activities = _ACTIVITIES_BY_AGENT.get(agent_id, ())
+    
+    # Limit results
+    activities = list(islice(activities, max(limit, 0)))
+    
+    return await _cache_response(
+        "activities", cache_key,
+        message="AI agent activities retrieved successfully",
+        data=activities
+    )
 
-@router.get("/admin/ai-agents/stats", response_model=ApiResponse)
-async def get_ai_agent_stats(
-    admin_user=Depends(verify_admin_token)
-):
+@admin_router.get("/admin/ai-agents/stats", response_model=ApiResponse)
+async def get_ai_agent_stats():
     """Get comprehensive AI agent statistics"""
-    try:
-        active_agents = len([a for a in MOCK_AI_AGENTS if a["status"] == "active"])
-        today_activities = len([a for a in MOCK_AI_ACTIVITIES if a["timestamp"].date() == datetime.now().date()])
-        avg_confidence = sum(a["confidence"] for a in MOCK_AI_ACTIVITIES) / len(MOCK_AI_ACTIVITIES)
-        success_rate = len([a for a in MOCK_AI_ACTIVITIES if a["status"] == "success"]) / len(MOCK_AI_ACTIVITIES) * 100
-        
-        stats = {
-            "total_agents": len(MOCK_AI_AGENTS),
-            "active_agents": active_agents,
-            "total_actions_today": today_activities,
-            "average_confidence": round(avg_confidence, 2),
-            "success_rate": round(success_rate, 2),
-            "issues_processed": 1247,
-            "categories_classified": 834,
-            "duplicates_detected": 23
-        }
-        
-        return ApiResponse(
-            success=True,
-            message="AI agent statistics retrieved successfully",
-            data=stats
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve AI stats: {str(e)}")
+    cached = await _cached_response("agent_stats", "all")
+    if cached:
+        return cached
+    
+    active_agents = len([a for a in MOCK_AI_AGENTS if a["status"] == "active"])
+    today_activities = _activities_per_day[date.today()]
+    activity_count = _activity_totals["count"] or 1
+    avg_confidence = _activity_totals["confidence_sum"] / activity_count
+    success_rate = _activity_totals["success"] / activity_count * 100
+    
+    stats = {
+        "total_agents": len(MOCK_AI_AGENTS),
+        "active_agents": active_agents,
+        "total_actions_today": today_activities,
+        "average_confidence": round(avg_confidence, 2),
+        "success_rate": round(success_rate, 2),
+        "issues_processed": 1247,
+        "categories_classified": 834,
+        "duplicates_detected": 23
+    }
+    
+    return await _cache_response(
+        "agent_stats", "all",
+        message="AI agent statistics retrieved successfully",
+        data=stats
+    )
 
-@router.put("/admin/ai-agents/{agent_id}/toggle", response_model=ApiResponse)
+@admin_router.put("/admin/ai-agents/{agent_id}/toggle", response_model=ApiResponse)
 async def toggle_ai_agent(
     agent_id: str,
-    enabled: bool,
-    admin_user=Depends(verify_admin_token)
+    enabled: bool
 ):
     """Enable or disable an AI agent"""
-    try:
-        # Find the agent
-        agent = next((a for a in MOCK_AI_AGENTS if a["agent_id"] == agent_id), None)
-        if not agent:
-            raise HTTPException(status_code=404, detail="AI agent not found")
-        
-        # Update the agent status
-        agent["enabled"] = enabled
-        agent["status"] = "active" if enabled else "inactive"
-        agent["last_activity"] = datetime.now()
-        
-        return ApiResponse(
-            success=True,
-            message=f"AI agent {'enabled' if enabled else 'disabled'} successfully",
-            data={"agent_id": agent_id, "enabled": enabled}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to toggle AI agent: {str(e)}")
+    # Find the agent
+    agent = _AGENTS_BY_ID.get(agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail="AI agent not found")
+    
+    # Update the agent status
+    agent["enabled"] = enabled
+    agent["status"] = "active" if enabled else "inactive"
+    agent["last_activity"] = datetime.now()
+    _invalidate_responses("agents", "agent_stats")
+    
+    return _api_response(
+        message=f"AI agent {'enabled' if enabled else 'disabled'} successfully",
+        data={"agent_id": agent_id, "enabled": enabled}
+    )
 
-@router.post("/admin/ai-agents/{agent_id}/restart", response_model=ApiResponse)
+async def _finish_restart(agent_id: str):
+    """Bring a restarting agent back up and log the restart"""
+    agent = _AGENTS_BY_ID[agent_id]
+    await asyncio.sleep(0.1)  # Simulate restart time
+    agent["status"] = "active" if agent["enabled"] else "inactive"
+    now = datetime.now()
+    agent["last_activity"] = now
+    
+    # Add restart activity
+    restart_activity = {
+        "id": _activity_id("restart"),
+        "agent_id": agent_id,
+        "agent_name": agent["name"],
+        "action": "Agent restarted",
+        "target_id": None,
+        "details": f"Manual restart initiated by admin",
+        "confidence": 100.0,
+        "timestamp": now,
+        "status": "success"
+    }
+    _push_activity(restart_activity)
+    _invalidate_responses("agents", "activities", "agent_stats")
+
+@admin_router.post("/admin/ai-agents/{agent_id}/restart", status_code=202, response_model=ApiResponse)
 async def restart_ai_agent(
     agent_id: str,
-    admin_user=Depends(verify_admin_token)
+    background_tasks: BackgroundTasks
 ):
-    """Restart an AI agent"""
-    try:
-        # Find the agent
-        agent = next((a for a in MOCK_AI_AGENTS if a["agent_id"] == agent_id), None)
-        if not agent:
-            raise HTTPException(status_code=404, detail="AI agent not found")
-        
-        # Simulate restart process
-        agent["status"] = "maintenance"
-        await asyncio.sleep(0.1)  # Simulate restart time
-        agent["status"] = "active" if agent["enabled"] else "inactive"
-        agent["last_activity"] = datetime.now()
-        
-        # Add restart activity
-        restart_activity = {
-            "id": f"restart-{datetime.now().timestamp()}",
-            "agent_id": agent_id,
-            "agent_name": agent["name"],
-            "action": "Agent restarted",
-            "target_id": None,
-            "details": f"Manual restart initiated by admin",
-            "confidence": 100.0,
-            "timestamp": datetime.now(),
-            "status": "success"
-        }
-        MOCK_AI_ACTIVITIES.insert(0, restart_activity)
-        
-        return ApiResponse(
-            success=True,
-            message="AI agent restarted successfully",
-            data={"agent_id": agent_id, "status": agent["status"]}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to restart AI agent: {str(e)}")
+    """
+    Restart an AI agent
+    Returns 202 Accepted while the agent is in maintenance; it comes back up in the background
+    """
+    # Find the agent
+    agent = _AGENTS_BY_ID.get(agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail="AI agent not found")
+    
+    # Simulate restart process
+    agent["status"] = "maintenance"
+    _invalidate_responses("agents", "agent_stats")
+    background_tasks.add_task(_finish_restart, agent_id)
+    
+    return _api_response(
+        message="AI agent restart initiated",
+        data={"agent_id": agent_id, "status": agent["status"]},
+        status_code=202
+    )
+
+# Mock configuration based on agent type
+MOCK_AGENT_CONFIGS = {
+    "classification-agent": {
+        "confidence_threshold": 0.85,
+        "categories": ["Infrastructure", "Sanitation", "Transportation", "Utilities", "Safety", "Environment"],
+        "max_retries": 3,
+        "timeout_seconds": 30
+    },
+    "priority-scoring-agent": {
+        "scoring_model": "weighted_factors",
+        "factors": {
+            "urgency": 0.4,
+            "impact": 0.3,
+            "location": 0.2,
+            "sentiment": 0.1
+        },
+        "score_range": [1, 10]
+    },
+    "sentiment-analysis-agent": {
+        "model": "bert-sentiment-v2",
+        "confidence_threshold": 0.7,
+        "sentiment_categories": ["positive", "neutral", "negative", "urgent", "frustrated"]
+    },
+    "duplicate-detection-agent": {
+        "similarity_threshold": 0.85,
+        "location_radius_km": 1.0,
+        "time_window_hours": 72,
+        "text_similarity_weight": 0.6,
+        "location_similarity_weight": 0.4
+    }
+}
 
-@router.get("/admin/ai-agents/{agent_id}/config", response_model=ApiResponse)
+# Configs pre-serialized for embedding in responses as they are
+_AGENT_CONFIG_JSON = {
+    agent_id: orjson.Fragment(orjson.dumps(config)) for agent_id, config in MOCK_AGENT_CONFIGS.items()
+}
+_DEFAULT_AGENT_CONFIG_JSON = orjson.Fragment(orjson.dumps({"message": "No specific configuration available"}))
+
+@admin_router.get("/admin/ai-agents/{agent_id}/config", response_model=ApiResponse)
 async def get_ai_agent_config(
-    agent_id: str,
-    admin_user=Depends(verify_admin_token)
+    agent_id: str
 ):
     """Get AI agent configuration"""
-    try:
-        # Find the agent
-        agent = next((a for a in MOCK_AI_AGENTS if a["agent_id"] == agent_id), None)
-        if not agent:
-            raise HTTPException(status_code=404, detail="AI agent not found")
-        
-        # Mock configuration based on agent type
-        configs = {
-            "classification-agent": {
-                "confidence_threshold": 0.85,
-                "categories": ["Infrastructure", "Sanitation", "Transportation", "Utilities", "Safety", "Environment"],
-                "max_retries": 3,
-                "timeout_seconds": 30
-            },
-            "priority-scoring-agent": {
-                "scoring_model": "weighted_factors",
-                "factors": {
-                    "urgency": 0.4,
-                    "impact": 0.3,
-                    "location": 0.2,
-                    "sentiment": 0.1
-                },
-                "score_range": [1, 10]
-            },
-            "sentiment-analysis-agent": {
-                "model": "bert-sentiment-v2",
-                "confidence_threshold": 0.7,
-                "sentiment_categories": ["positive", "neutral", "negative", "urgent", "frustrated"]
-            },
-            "duplicate-detection-agent": {
-                "similarity_threshold": 0.85,
-                "location_radius_km": 1.0,
-                "time_window_hours": 72,
-                "text_similarity_weight": 0.6,
-                "location_similarity_weight": 0.4
-            }
+    # Find the agent
+    agent = _AGENTS_BY_ID.get(agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail="AI agent not found")
+    
+    config = _AGENT_CONFIG_JSON.get(agent_id, _DEFAULT_AGENT_CONFIG_JSON)
+    
+    return _api_response(
+        message="AI agent configuration retrieved successfully",
+        data={
+            "agent_id": agent_id,
+            "config": config,
+            "enabled": agent["enabled"],
+            "priority": 1
         }
-        
-        config = configs.get(agent_id, {"message": "No specific configuration available"})
-        
-        return ApiResponse(
-            success=True,
-            message="AI agent configuration retrieved successfully",
-            data={
-                "agent_id": agent_id,
-                "config": config,
-                "enabled": agent["enabled"],
-                "priority": 1
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve AI agent config: {str(e)}")
+    )
 
-@router.put("/admin/ai-agents/{agent_id}/config", response_model=ApiResponse)
+@admin_router.put(
+    "/admin/ai-agents/{agent_id}/config",
+    response_model=ApiResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": {"type": "object", "additionalProperties": True}}},
+        }
+    }
+)
 async def update_ai_agent_config(
     agent_id: str,
-    config: Dict[str, Any],
-    admin_user=Depends(verify_admin_token)
+    request: Request
 ):
-    """Update AI agent configuration"""
+    """
+    Update AI agent configuration
+    Internal endpoint: the admin UI checks the config against the agent's schema,
+    so the body is only parsed here, not validated item by item
+    """
+    # Find the agent
+    agent = _AGENTS_BY_ID.get(agent_id)
+    if not agent:
+        raise HTTPException(status_code=404, detail="AI agent not found")
+    
     try:
-        # Find the agent
-        agent = next((a for a in MOCK_AI_AGENTS if a["agent_id"] == agent_id), None)
-        if not agent:
-            raise HTTPException(status_code=404, detail="AI agent not found")
-        
-        # In a real implementation, this would validate and update the agent's configuration
-        # For now, we'll just simulate the update
-        
-        # Add configuration update activity
-        config_activity = {
-            "id": f"config-{datetime.now().timestamp()}",
-            "agent_id": agent_id,
-            "agent_name": agent["name"],
-            "action": "Configuration updated",
-            "target_id": None,
-            "details": f"Configuration modified by admin: {list(config.keys())}",
-            "confidence": 100.0,
-            "timestamp": datetime.now(),
-            "status": "success"
-        }
-        MOCK_AI_ACTIVITIES.insert(0, config_activity)
-        
-        return ApiResponse(
-            success=True,
-            message="AI agent configuration updated successfully",
-            data={"agent_id": agent_id, "updated_config": config}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update AI agent config: {str(e)}")
+        config = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    if not isinstance(config, dict):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Configuration must be a JSON object")
+    
+    # In a real implementation, this would validate and update the agent's configuration
+    # For now, we'll just simulate the update
+    
+    # Add configuration update activity
+    config_activity = {
+        "id": _activity_id("config"),
+        "agent_id": agent_id,
+        "agent_name": agent["name"],
+        "action": "Configuration updated",
+        "target_id": None,
+        "details": f"Configuration modified by admin: {list(config.keys())}",
+        "confidence": 100.0,
+        "timestamp": datetime.now(),
+        "status": "success"
+    }
+    _push_activity(config_activity)
+    _invalidate_responses("activities", "agent_stats")
+    
+    return _api_response(
+        message="AI agent configuration updated successfully",
+        data={"agent_id": agent_id, "updated_config": config}
+    )
+
+async def _run_processing_step(job: Dict[str, Any], result: Dict[str, Any]):
+    """One agent's simulated pass over a job's issue"""
+    issue_id = job["issue_id"]
+    agent_id = result["agent"]
+    # Add processing activity
+    activity = {
+        "id": f"{_activity_id('proc')}-{agent_id}",
+        "agent_id": agent_id,
+        "agent_name": _AGENTS_BY_ID[agent_id]["name"],
+        "action": result["action"],
+        "target_id": issue_id,
+        "details": f"Manual processing triggered for issue {issue_id}",
+        "confidence": result["confidence"],
+        "timestamp": datetime.now(),
+        "status": "success"
+    }
+    _push_activity(activity)
+    _invalidate_responses("activities", "agent_stats")
+    
+    # Small delay to simulate processing time
+    await asyncio.sleep(0.05)
+    result["status"] = "completed"
+    await _save_job(job)
 
-@router.post("/admin/ai-agents/process-issue", response_model=ApiResponse)
+async def _process_issue(job: Dict[str, Any]):
+    """Run the simulated agents over an issue side by side, updating the job as each step completes"""
+    await asyncio.gather(*(
+        _run_processing_step(job, result) for result in job["processing_results"]
+    ))
+    job["status"] = "completed"
+    await _save_job(job)
+
+@admin_router.post("/admin/ai-agents/process-issue", status_code=202, response_model=ApiResponse)
 async def process_issue_with_ai(
     issue_id: str,
-    force_reprocess: bool = False,
-    admin_user=Depends(verify_admin_token)
+    background_tasks: BackgroundTasks,
+    force_reprocess: bool = False
 ):
-    """Manually trigger AI processing for a specific issue"""
-    try:
-        # Simulate AI processing
-        processing_steps = [
-            ("classification-agent", "Analyzing issue category", 92.5),
-            ("priority-scoring-agent", "Calculating priority score", 88.3),
-            ("sentiment-analysis-agent", "Analyzing sentiment", 94.1),
-            ("duplicate-detection-agent", "Checking for duplicates", 96.7)
-        ]
-        
-        results = []
-        for agent_id, action, confidence in processing_steps:
-            # Add processing activity
-            activity = {
-                "id": f"proc-{datetime.now().timestamp()}-{agent_id}",
-                "agent_id": agent_id,
-                "agent_name": next(a["name"] for a in MOCK_AI_AGENTS if a["agent_id"] == agent_id),
-                "action": action,
-                "target_id": issue_id,
-                "details": f"Manual processing triggered for issue {issue_id}",
-                "confidence": confidence,
-                "timestamp": datetime.now(),
-                "status": "success"
-            }
-            MOCK_AI_ACTIVITIES.insert(0, activity)
-            results.append({
-                "agent": agent_id,
-                "action": action,
-                "confidence": confidence,
-                "status": "completed"
-            })
-            
-            # Small delay to simulate processing time
-            await asyncio.sleep(0.05)
-        
-        return ApiResponse(
-            success=True,
-            message=f"Issue {issue_id} processed by AI agents successfully",
-            data={
-                "issue_id": issue_id,
-                "processing_results": results,
-                "total_agents": len(results)
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to process issue with AI: {str(e)}")
+    """
+    Manually trigger AI processing for a specific issue
+    Returns 202 Accepted with a job_id; poll /admin/ai-agents/process-issue/{job_id} for progress.
+    With several workers and no Redis the job is finished first and returned completed.
+    """
+    # Simulate AI processing
+    processing_steps = [
+        ("classification-agent", "Analyzing issue category", 92.5),
+        ("priority-scoring-agent", "Calculating priority score", 88.3),
+        ("sentiment-analysis-agent", "Analyzing sentiment", 94.1),
+        ("duplicate-detection-agent", "Checking for duplicates", 96.7)
+    ]
+    
+    job = {
+        "job_id": uuid.uuid4().hex,
+        "issue_id": issue_id,
+        "status": "processing",
+        "processing_results": [
+            {"agent": agent_id, "action": action, "confidence": confidence, "status": "pending"}
+            for agent_id, action, confidence in processing_steps
+        ],
+        "total_agents": len(processing_steps)
+    }
+    await _save_job(job)
+    if not _JOBS_POLLABLE:
+        await _process_issue(job)
+        return _api_response(message=f"Issue {issue_id} processed by AI agents", data=job)
+    background_tasks.add_task(_process_issue, job)
+    
+    return _api_response(
+        message=f"Issue {issue_id} queued for AI processing",
+        data=job,
+        status_code=202
+    )
 
-@router.get("/admin/analytics", response_model=ApiResponse)
+@admin_router.get("/admin/ai-agents/process-issue/{job_id}", response_model=ApiResponse)
+async def get_processing_job(
+    job_id: str
+):
+    """Get the progress of a manual AI processing job"""
+    job = await _load_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Processing job not found")
+    return _api_response(message="Processing job retrieved successfully", data=job)
+
+# Mock analytics data that matches the frontend structure
+MOCK_ANALYTICS_DATA = {
+    "issuesByCategory": [
+        {"name": "Infrastructure", "count": 456, "color": "#8884d8"},
+        {"name": "Sanitation", "count": 342, "color": "#82ca9d"},
+        {"name": "Transportation", "count": 234, "color": "#ffc658"},
+        {"name": "Utilities", "count": 189, "color": "#ff7c7c"},
+        {"name": "Safety", "count": 123, "color": "#8dd1e1"},
+        {"name": "Environment", "count": 98, "color": "#d084d0"}
+    ],
+    "issuesTrend": [
+        {"date": "2024-01-01", "new": 45, "resolved": 32, "total": 234},
+        {"date": "2024-01-02", "new": 52, "resolved": 38, "total": 248},
+        {"date": "2024-01-03", "new": 38, "resolved": 45, "total": 241},
+        {"date": "2024-01-04", "new": 61, "resolved": 42, "total": 260},
+        {"date": "2024-01-05", "new": 55, "resolved": 48, "total": 267},
+        {"date": "2024-01-06", "new": 49, "resolved": 52, "total": 264},
+        {"date": "2024-01-07", "new": 67, "resolved": 43, "total": 288}
+    ],
+    "userActivity": [
+        {"date": "2024-01-01", "active": 1234, "new": 23},
+        {"date": "2024-01-02", "active": 1267, "new": 34},
+        {"date": "2024-01-03", "active": 1298, "new": 31},
+        {"date": "2024-01-04", "active": 1345, "new": 47},
+        {"date": "2024-01-05", "active": 1389, "new": 44},
+        {"date": "2024-01-06", "active": 1412, "new": 23},
+        {"date": "2024-01-07", "active": 1456, "new": 44}
+    ],
+    "priorityDistribution": [
+        {"name": "High", "value": 25, "color": "#ff4444"},
+        {"name": "Medium", "value": 45, "color": "#ffaa44"},
+        {"name": "Low", "value": 30, "color": "#44ff44"}
+    ],
+    "responseTime": [
+        {"category": "Infrastructure", "avgHours": 24},
+        {"category": "Sanitation", "avgHours": 18},
+        {"category": "Transportation", "avgHours": 36},
+        {"category": "Utilities", "avgHours": 12},
+        {"category": "Safety", "avgHours": 6},
+        {"category": "Environment", "avgHours": 48}
+    ],
+    "resolutionRate": [
+        {"month": "Jan", "rate": 78},
+        {"month": "Feb", "rate": 82},
+        {"month": "Mar", "rate": 85},
+        {"month": "Apr", "rate": 89},
+        {"month": "May", "rate": 92},
+        {"month": "Jun", "rate": 88}
+    ]
+}
+
+# Serialized once; the analytics response never changes
+_ANALYTICS_RESPONSE = orjson.dumps(
+    {"success": True, "message": "Analytics data retrieved successfully", "data": MOCK_ANALYTICS_DATA}
+)
+
+@admin_router.get("/admin/analytics", response_model=ApiResponse)
 async def get_analytics_data(
-    range: str = Query("30", description="Date range in days"),
-    admin_user=Depends(verify_admin_token)
+    range: str = Query("30", description="Date range in days")
 ):
     """Get analytics data for the analytics dashboard"""
-    try:
-        # Mock analytics data that matches the frontend structure
-        analytics_data = {
-            "issuesByCategory": [
-                {"name": "Infrastructure", "count": 456, "color": "#8884d8"},
-                {"name": "Sanitation", "count": 342, "color": "#82ca9d"},
-                {"name": "Transportation", "count": 234, "color": "#ffc658"},
-                {"name": "Utilities", "count": 189, "color": "#ff7c7c"},
-                {"name": "Safety", "count": 123, "color": "#8dd1e1"},
-                {"name": "Environment", "count": 98, "color": "#d084d0"}
-            ],
-            "issuesTrend": [
-                {"date": "2024-01-01", "new": 45, "resolved": 32, "total": 234},
-                {"date": "2024-01-02", "new": 52, "resolved": 38, "total": 248},
-                {"date": "2024-01-03", "new": 38, "resolved": 45, "total": 241},
-                {"date": "2024-01-04", "new": 61, "resolved": 42, "total": 260},
-                {"date": "2024-01-05", "new": 55, "resolved": 48, "total": 267},
-                {"date": "2024-01-06", "new": 49, "resolved": 52, "total": 264},
-                {"date": "2024-01-07", "new": 67, "resolved": 43, "total": 288}
-            ],
-            "userActivity": [
-                {"date": "2024-01-01", "active": 1234, "new": 23},
-                {"date": "2024-01-02", "active": 1267, "new": 34},
-                {"date": "2024-01-03", "active": 1298, "new": 31},
-                {"date": "2024-01-04", "active": 1345, "new": 47},
-                {"date": "2024-01-05", "active": 1389, "new": 44},
-                {"date": "2024-01-06", "active": 1412, "new": 23},
-                {"date": "2024-01-07", "active": 1456, "new": 44}
-            ],
-            "priorityDistribution": [
-                {"name": "High", "value": 25, "color": "#ff4444"},
-                {"name": "Medium", "value": 45, "color": "#ffaa44"},
-                {"name": "Low", "value": 30, "color": "#44ff44"}
-            ],
-            "responseTime": [
-                {"category": "Infrastructure", "avgHours": 24},
-                {"category": "Sanitation", "avgHours": 18},
-                {"category": "Transportation", "avgHours": 36},
-                {"category": "Utilities", "avgHours": 12},
-                {"category": "Safety", "avgHours": 6},
-                {"category": "Environment", "avgHours": 48}
-            ],
-            "resolutionRate": [
-                {"month": "Jan", "rate": 78},
-                {"month": "Feb", "rate": 82},
-                {"month": "Mar", "rate": 85},
-                {"month": "Apr", "rate": 89},
-                {"month": "May", "rate": 92},
-                {"month": "Jun", "rate": 88}
-            ]
-        }
-        
-        return ApiResponse(
-            success=True,
-            message="Analytics data retrieved successfully",
-            data=analytics_data
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve analytics: {str(e)}")
+    # The mock data doesn't depend on range yet
+    return Response(_ANALYTICS_RESPONSE, media_type="application/json")
 
 # Additional admin endpoints for the dashboard
 
-@router.get("/admin/stats", response_model=ApiResponse)
-async def get_admin_stats(
-    admin_user=Depends(verify_admin_token)
-):
+@admin_router.get("/admin/stats", response_model=ApiResponse)
+async def get_admin_stats():
     """Get admin dashboard statistics"""
-    try:
-        stats = {
-            "totalIssues": 1234,
-            "activeUsers": 8456,
-            "resolvedIssues": 892,
-            "pendingIssues": 342,
-            "issueChangePercent": "+12%",
-            "userChangePercent": "+8%",
-            "resolvedChangePercent": "+15%",
-            "pendingChangePercent": "-5%"
-        }
-        
-        return ApiResponse(
-            success=True,
-            message="Admin statistics retrieved successfully", 
-            data=stats
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve admin stats: {str(e)}")
+    cached = await _cached_response("admin_stats", "all")
+    if cached:
+        return cached
+    
+    stats = {
+        "totalIssues": 1234,
+        "activeUsers": 8456,
+        "resolvedIssues": 892,
+        "pendingIssues": 342,
+        "issueChangePercent": "+12%",
+        "userChangePercent": "+8%",
+        "resolvedChangePercent": "+15%",
+        "pendingChangePercent": "-5%"
+    }
+    
+    return await _cache_response(
+        "admin_stats", "all",
+        message="Admin statistics retrieved successfully",
+        data=stats
+    )
 
-@router.get("/admin/issues", response_model=ApiResponse)
+@admin_router.get("/admin/issues", response_model=ApiResponse)
 async def get_admin_issues(
     page: int = Query(1, description="Page number"),
     limit: int = Query(10, description="Items per page"),
-    filter: Optional[str] = Query(None, description="Search filter"),
-    admin_user=Depends(verify_admin_token)
+    filter: Optional[str] = Query(None, description="Search filter")
 ):
     """Get issues for admin management"""
-    try:
-        # Mock issues data for admin
-        mock_issues = [
-            {
-                "id": "1",
-                "title": "Broken streetlight on Main Road",
-                "description": "Multiple streetlights are not working, making the area unsafe at night.",
-                "category": "Infrastructure",
-                "status": "New",
-                "priority": "High",
-                "location": "Main Road, Sector 12",
-                "submittedBy": "Rahul Kumar",
-                "submittedAt": "2024-01-07T10:30:00Z",
-                "upvotes": 23,
-                "images": 3,
-                "aiSentiment": "Concerned",
-                "aiPriority": 8.7
-            },
-            {
-                "id": "2", 
-                "title": "Water leakage in Central Park",
-                "description": "Large water leak near the main entrance causing flooding.",
-                "category": "Utilities",
-                "status": "In Progress",
-                "priority": "Medium",
-                "location": "Central Park, Sector 8",
-                "submittedBy": "Priya Sharma",
-                "submittedAt": "2024-01-07T08:15:00Z",
-                "upvotes": 15,
-                "images": 2,
-                "aiSentiment": "Urgent",
-                "aiPriority": 7.2
-            },
-            {
-                "id": "3",
-                "title": "Garbage collection missed",
-                "description": "Garbage has not been collected for 3 days in residential area.",
-                "category": "Sanitation", 
-                "status": "Resolved",
-                "priority": "Low",
-                "location": "Residential Area, Sector 15",
-                "submittedBy": "Amit Singh",
-                "submittedAt": "2024-01-07T06:45:00Z",
-                "upvotes": 8,
-                "images": 1,
-                "aiSentiment": "Frustrated",
-                "aiPriority": 4.5
-            }
-        ]
-        
-        # Apply filter if provided
-        if filter:
-            mock_issues = [issue for issue in mock_issues if 
-                          filter.lower() in issue["title"].lower() or 
-                          filter.lower() in issue["description"].lower()]
-        
-        # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_issues = mock_issues[start_idx:end_idx]
-        
-        return ApiResponse(
-            success=True,
-            message="Issues retrieved successfully",
-            data={
-                "issues": paginated_issues,
-                "total": len(mock_issues),
-                "page": page,
-                "limit": limit
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve issues: {str(e)}")
+    # Mock issues data for admin
+    mock_issues = [
+        {
+            "id": "1",
+            "title": "Broken streetlight on Main Road",
+            "description": "Multiple streetlights are not working, making the area unsafe at night.",
+            "category": "Infrastructure",
+            "status": "New",
+            "priority": "High",
+            "location": "Main Road, Sector 12",
+            "submittedBy": "Rahul Kumar",
+            "submittedAt": "2024-01-07T10:30:00Z",
+            "upvotes": 23,
+            "images": 3,
+            "aiSentiment": "Concerned",
+            "aiPriority": 8.7
+        },
+        {
+            "id": "2", 
+            "title": "Water leakage in Central Park",
+            "description": "Large water leak near the main entrance causing flooding.",
+            "category": "Utilities",
+            "status": "In Progress",
+            "priority": "Medium",
+            "location": "Central Park, Sector 8",
+            "submittedBy": "Priya Sharma",
+            "submittedAt": "2024-01-07T08:15:00Z",
+            "upvotes": 15,
+            "images": 2,
+            "aiSentiment": "Urgent",
+            "aiPriority": 7.2
+        },
+        {
+            "id": "3",
+            "title": "Garbage collection missed",
+            "description": "Garbage has not been collected for 3 days in residential area.",
+            "category": "Sanitation", 
+            "status": "Resolved",
+            "priority": "Low",
+            "location": "Residential Area, Sector 15",
+            "submittedBy": "Amit Singh",
+            "submittedAt": "2024-01-07T06:45:00Z",
+            "upvotes": 8,
+            "images": 1,
+            "aiSentiment": "Frustrated",
+            "aiPriority": 4.5
+        }
+    ]
+    
+    # Apply filter if provided
+    if filter:
+        mock_issues = [issue for issue in mock_issues if 
+                      filter.lower() in issue["title"].lower() or 
+                      filter.lower() in issue["description"].lower()]
+    
+    # Pagination
+    start_idx = (page - 1) * limit
+    end_idx = start_idx + limit
+    paginated_issues = mock_issues[start_idx:end_idx]
+    
+    return _api_response(
+        message="Issues retrieved successfully",
+        data={
+            "issues": paginated_issues,
+            "total": len(mock_issues),
+            "page": page,
+            "limit": limit
+        }
+    )
 
-@router.put("/admin/issues/{issue_id}/status", response_model=ApiResponse)
+@admin_router.put("/admin/issues/{issue_id}/status", response_model=ApiResponse)
 async def update_issue_status(
     issue_id: str,
-    status: str,
-    admin_user=Depends(verify_admin_token)
+    status: str
 ):
     """Update issue status"""
-    try:
-        # In a real implementation, this would update the database
-        return ApiResponse(
-            success=True,
-            message="Issue status updated successfully",
-            data={"issue_id": issue_id, "new_status": status}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update issue status: {str(e)}")
+    # In a real implementation, this would update the database
+    return _api_response(
+        message="Issue status updated successfully",
+        data={"issue_id": issue_id, "new_status": status}
+    )
 
-@router.delete("/admin/issues/{issue_id}", response_model=ApiResponse)
+@admin_router.delete("/admin/issues/{issue_id}", response_model=ApiResponse)
 async def delete_issue(
-    issue_id: str,
-    admin_user=Depends(verify_admin_token)
+    issue_id: str
 ):
     """Delete an issue"""
-    try:
-        # In a real implementation, this would delete from the database
-        return ApiResponse(
-            success=True,
-            message="Issue deleted successfully",
-            data={"issue_id": issue_id}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to delete issue: {str(e)}")
+    # In a real implementation, this would delete from the database
+    return _api_response(
+        message="Issue deleted successfully",
+        data={"issue_id": issue_id}
+    )
 
-@router.get("/admin/users", response_model=ApiResponse)
+@admin_router.get("/admin/users", response_model=ApiResponse)
 async def get_admin_users(
     page: int = Query(1, description="Page number"),
-    limit: int = Query(10, description="Items per page"),
-    admin_user=Depends(verify_admin_token)
+    limit: int = Query(10, description="Items per page")
 ):
     """Get users for admin management"""
-    try:
-        # Mock users data
-        mock_users = [
-            {
-                "id": "user-1",
-                "phone": "+91-9876543210",
-                "fullName": "Rahul Kumar",
-                "email": "rahul.kumar@email.com",
-                "joinedAt": "2024-01-01T10:00:00Z",
-                "issuesReported": 12,
-                "lastActive": "2024-01-07T09:30:00Z",
-                "status": "active"
-            },
-            {
-                "id": "user-2",
-                "phone": "+91-9876543211", 
-                "fullName": "Priya Sharma",
-                "email": "priya.sharma@email.com",
-                "joinedAt": "2024-01-02T14:30:00Z",
-                "issuesReported": 8,
-                "lastActive": "2024-01-07T08:15:00Z",
-                "status": "active"
-            },
-            {
-                "id": "user-3",
-                "phone": "+91-9876543212",
-                "fullName": "Amit Singh", 
-                "email": "amit.singh@email.com",
-                "joinedAt": "2024-01-03T16:45:00Z",
-                "issuesReported": 15,
-                "lastActive": "2024-01-06T18:20:00Z",
-                "status": "inactive"
-            }
-        ]
-        
-        # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_users = mock_users[start_idx:end_idx]
-        
-        return ApiResponse(
-            success=True,
-            message="Users retrieved successfully",
-            data={
-                "users": paginated_users,
-                "total": len(mock_users),
-                "page": page,
-                "limit": limit
-            }
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to retrieve users: {str(e)}")
+    # Mock users data
+    mock_users = [
+        {
+            "id": "user-1",
+            "phone": "+91-9876543210",
+            "fullName": "Rahul Kumar",
+            "email": "rahul.kumar@email.com",
+            "joinedAt": "2024-01-01T10:00:00Z",
+            "issuesReported": 12,
+            "lastActive": "2024-01-07T09:30:00Z",
+            "status": "active"
+        },
+        {
+            "id": "user-2",
+            "phone": "+91-9876543211", 
+            "fullName": "Priya Sharma",
+            "email": "priya.sharma@email.com",
+            "joinedAt": "2024-01-02T14:30:00Z",
+            "issuesReported": 8,
+            "lastActive": "2024-01-07T08:15:00Z",
+            "status": "active"
+        },
+        {
+            "id": "user-3",
+            "phone": "+91-9876543212",
+            "fullName": "Amit Singh", 
+            "email": "amit.singh@email.com",
+            "joinedAt": "2024-01-03T16:45:00Z",
+            "issuesReported": 15,
+            "lastActive": "2024-01-06T18:20:00Z",
+            "status": "inactive"
+        }
+    ]
+    
+    # Pagination
+    start_idx = (page - 1) * limit
+    end_idx = start_idx + limit
+    paginated_users = mock_users[start_idx:end_idx]
+    
+    return _api_response(
+        message="Users retrieved successfully",
+        data={
+            "users": paginated_users,
+            "total": len(mock_users),
+            "page": page,
+            "limit": limit
+        }
+    )
 
-@router.put("/admin/users/{user_id}/status", response_model=ApiResponse)
+@admin_router.put("/admin/users/{user_id}/status", response_model=ApiResponse)
 async def update_user_status(
     user_id: str,
-    status: str,
-    admin_user=Depends(verify_admin_token)
+    status: str
 ):
     """Update user status"""
-    try:
-        # In a real implementation, this would update the database
-        return ApiResponse(
-            success=True,
-            message="User status updated successfully",
-            data={"user_id": user_id, "new_status": status}
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to update user status: {str(e)}")
+    # In a real implementation, this would update the database
+    return _api_response(
+        message="User status updated successfully",
+        data={"user_id": user_id, "new_status": status}
+    )
 
 @router.post("/admin/auth/login", response_model=ApiResponse)
 async def admin_login(
@@ -748,44 +913,32 @@ async def admin_login(
     password: str
 ):
     """Admin login endpoint for demo credentials"""
-    try:
-        # Check demo credentials
-        if email in DEMO_ADMIN_CREDENTIALS and DEMO_ADMIN_CREDENTIALS[email] == password:
-            # Generate a simple demo token
-            demo_token = f"demo-{email.replace('@', '-').replace('.', '-')}"
-            
-            return ApiResponse(
-                success=True,
-                message="Admin login successful",
-                data={
-                    "token": demo_token,
-                    "user": {
-                        "email": email,
-                        "name": "Demo Admin",
-                        "role": "admin"
-                    }
+    # Check demo credentials
+    demo_token = demo_login(email, password)
+    if demo_token:
+        return _api_response(
+            message="Admin login successful",
+            data={
+                "token": demo_token,
+                "user": {
+                    "email": email,
+                    "name": "Demo Admin",
+                    "role": "admin"
                 }
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid admin credentials"
-            )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Login failed: {str(e)}")
-
-@router.post("/admin/auth/logout", response_model=ApiResponse)
-async def admin_logout(
-    admin_user=Depends(verify_admin_token)
-):
-    """Admin logout endpoint"""
-    try:
-        return ApiResponse(
-            success=True,
-            message="Admin logout successful",
-            data={"success": True}
+            }
+        )
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin credentials"
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Logout failed: {str(e)}")
+
+@admin_router.post("/admin/auth/logout", response_model=ApiResponse)
+async def admin_logout():
+    """Admin logout endpoint"""
+    return _api_response(
+        message="Admin logout successful",
+        data={"success": True}
+    )
+
+router.include_router(admin_router)
@@ -1,10 +1,13 @@
 """
 Working AI Agents Router - Completely Fixed Version
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Query, Response
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+import secrets
+import orjson
+from cachetools import TTLCache
 
 router = APIRouter()
 
@@ -18,13 +21,77 @@ DEMO_ADMIN_CREDENTIALS = {
     "username": "admin",
     "password": "admin"
 }
+_DEMO_USERNAME = DEMO_ADMIN_CREDENTIALS["username"].encode()
+_DEMO_PASSWORD = DEMO_ADMIN_CREDENTIALS["password"].encode()
+
+# Demo datasets, built once at import; handlers only filter and slice them
+_DEMO_CREATED_AT = datetime.now()
+
+_DEMO_ISSUES = tuple(
+    {
+        "id": f"issue-{i}",
+        "title": f"Sample Issue {i}",
+        "description": f"Description for issue {i}",
+        "status": "active" if i % 3 == 0 else "resolved",
+        "category": "infrastructure" if i % 2 == 0 else "environment",
+        "priority": "high" if i % 4 == 0 else "medium",
+        "created_at": _DEMO_CREATED_AT.isoformat(),
+        "upvotes": i * 3,
+        "downvotes": i,
+        "user_id": f"user-{i % 10}"
+    }
+    for i in range(1, 21)
+)
+
+_DEMO_USERS = tuple(
+    {
+        "id": f"user-{i}",
+        "name": f"User {i}",
+        "email": f"user{i}@example.com",
+        "phone": f"+91987654{i:04d}",
+        "status": "active" if i % 4 != 0 else "inactive",
+        "join_date": _DEMO_CREATED_AT.isoformat(),
+        "issues_count": i % 8,
+        "city": "Mumbai" if i % 3 == 0 else "Delhi"
+    }
+    for i in range(1, 51)
+)
+
+_DEMO_ACTIVITIES = tuple(
+    {
+        "id": f"activity-{i}",
+        "agent_id": f"agent-00{(i % 3) + 1}",
+        "agent_name": ["Issue Classifier", "Sentiment Analyzer", "Priority Detector"][i % 3],
+        "action": ["classified_issue", "analyzed_sentiment", "detected_priority"][i % 3],
+        "target_id": f"issue-{i}",
+        "result": "success" if i % 5 != 0 else "failed",
+        "timestamp": (_DEMO_CREATED_AT - timedelta(minutes=i*2)).isoformat(),
+        "details": f"Processed item {i} successfully"
+    }
+    for i in range(1, 31)
+)
+
+def _group_by(items: tuple, field: str) -> Dict[str, tuple]:
+    """Items bucketed by the value of one field, keeping their order"""
+    groups: Dict[str, list] = {}
+    for item in items:
+        groups.setdefault(item[field], []).append(item)
+    return {value: tuple(group) for value, group in groups.items()}
+
+_DEMO_ISSUES_BY_STATUS = _group_by(_DEMO_ISSUES, "status")
+
+# Fixed auth replies, serialized once
+_INVALID_CREDENTIALS_RESPONSE = orjson.dumps({"detail": "Invalid admin credentials"})
+_LOGOUT_RESPONSE = orjson.dumps({"success": True, "message": "Admin logout successful"})
 
 # Admin Authentication
 @router.post("/admin/auth/login")
 async def admin_login(credentials: AdminLogin):
     """Admin login endpoint"""
-    if (credentials.username == DEMO_ADMIN_CREDENTIALS["username"] and 
-        credentials.password == DEMO_ADMIN_CREDENTIALS["password"]):
+    # Check both fields in constant time, so neither match shows in the timing
+    username_ok = secrets.compare_digest(credentials.username.encode(), _DEMO_USERNAME)
+    password_ok = secrets.compare_digest(credentials.password.encode(), _DEMO_PASSWORD)
+    if username_ok and password_ok:
         return {
             "success": True,
             "message": "Admin login successful",
@@ -34,29 +101,32 @@ async def admin_login(credentials: AdminLogin):
             }
         }
     else:
-        raise HTTPException(status_code=401, detail="Invalid admin credentials")
+        return Response(_INVALID_CREDENTIALS_RESPONSE, status_code=401, media_type="application/json")
 
 @router.post("/admin/auth/logout")
 async def admin_logout():
     """Admin logout endpoint"""
-    return {"success": True, "message": "Admin logout successful"}
+    return Response(_LOGOUT_RESPONSE, media_type="application/json")
 
 # Admin Dashboard Statistics
+# Constant payloads are serialized once at import and sent as raw bytes
+_ADMIN_STATS_RESPONSE = orjson.dumps({
+    "success": True,
+    "message": "Statistics retrieved successfully",
+    "data": {
+        "total_issues": 156,
+        "total_users": 89,
+        "active_issues": 34,
+        "resolved_issues": 102,
+        "pending_issues": 20,
+        "active_agents": 3
+    }
+})
+
 @router.get("/admin/stats")
 async def get_admin_stats():
     """Get admin dashboard statistics"""
-    return {
-        "success": True,
-        "message": "Statistics retrieved successfully",
-        "data": {
-            "total_issues": 156,
-            "total_users": 89,
-            "active_issues": 34,
-            "resolved_issues": 102,
-            "pending_issues": 20,
-            "active_agents": 3
-        }
-    }
+    return Response(_ADMIN_STATS_RESPONSE, media_type="application/json")
 
 # Issues Management
 @router.get("/admin/issues")
@@ -66,25 +136,7 @@ async def get_admin_issues(
     status: Optional[str] = Query(None)
 ):
     """Get all issues for admin management"""
-    # Demo data
-    issues = [
-        {
-            "id": f"issue-{i}",
-            "title": f"Sample Issue {i}",
-            "description": f"Description for issue {i}",
-            "status": "active" if i % 3 == 0 else "resolved",
-            "category": "infrastructure" if i % 2 == 0 else "environment",
-            "priority": "high" if i % 4 == 0 else "medium",
-            "created_at": datetime.now().isoformat(),
-            "upvotes": i * 3,
-            "downvotes": i,
-            "user_id": f"user-{i % 10}"
-        }
-        for i in range(1, 21)
-    ]
-    
-    if status:
-        issues = [issue for issue in issues if issue["status"] == status]
+    issues = _DEMO_ISSUES_BY_STATUS.get(status, ()) if status else _DEMO_ISSUES
     
     # Pagination
     start = (page - 1) * limit
@@ -131,19 +183,7 @@ async def get_admin_users(
     limit: int = Query(10, ge=1, le=100)
 ):
     """Get all users for admin management"""
-    users = [
-        {
-            "id": f"user-{i}",
-            "name": f"User {i}",
-            "email": f"user{i}@example.com",
-            "phone": f"+91987654{i:04d}",
-            "status": "active" if i % 4 != 0 else "inactive",
-            "join_date": datetime.now().isoformat(),
-            "issues_count": i % 8,
-            "city": "Mumbai" if i % 3 == 0 else "Delhi"
-        }
-        for i in range(1, 51)
-    ]
+    users = _DEMO_USERS
     
     start = (page - 1) * limit
     end = start + limit
@@ -174,60 +214,68 @@ async def update_user_status(user_id: str, status: str = Query(...)):
     }
 
 # AI Agents Management
+# Fixed agent fields, paired with how long ago each agent was last active
+_DEMO_AGENTS = (
+    ({
+        "agent_id": "agent-001",
+        "name": "Issue Classifier",
+        "status": "active",
+        "total_actions": 1247,
+        "success_rate": 94.5,
+        "enabled": True
+    }, timedelta(0)),
+    ({
+        "agent_id": "agent-002",
+        "name": "Sentiment Analyzer",
+        "status": "active",
+        "total_actions": 892,
+        "success_rate": 91.2,
+        "enabled": True
+    }, timedelta(minutes=5)),
+    ({
+        "agent_id": "agent-003",
+        "name": "Priority Detector",
+        "status": "maintenance",
+        "total_actions": 654,
+        "success_rate": 88.7,
+        "enabled": False
+    }, timedelta(hours=2)),
+)
+
+# last_activity is relative to now, so the serialized list is only reused briefly
+_ai_agents_response = TTLCache(maxsize=1, ttl=5)
+
 @router.get("/admin/ai-agents")
 async def get_ai_agents():
     """Get all AI agents status"""
-    agents = [
-        {
-            "agent_id": "agent-001",
-            "name": "Issue Classifier",
-            "status": "active",
-            "last_activity": datetime.now().isoformat(),
-            "total_actions": 1247,
-            "success_rate": 94.5,
-            "enabled": True
-        },
-        {
-            "agent_id": "agent-002", 
-            "name": "Sentiment Analyzer",
-            "status": "active",
-            "last_activity": (datetime.now() - timedelta(minutes=5)).isoformat(),
-            "total_actions": 892,
-            "success_rate": 91.2,
-            "enabled": True
-        },
-        {
-            "agent_id": "agent-003",
-            "name": "Priority Detector",
-            "status": "maintenance",
-            "last_activity": (datetime.now() - timedelta(hours=2)).isoformat(),
-            "total_actions": 654,
-            "success_rate": 88.7,
-            "enabled": False
-        }
-    ]
-    
-    return {
-        "success": True,
-        "message": "AI agents retrieved successfully",
-        "data": {"agents": agents}
+    body = _ai_agents_response.get("agents")
+    if body is None:
+        now = datetime.now()
+        body = orjson.dumps({
+            "success": True,
+            "message": "AI agents retrieved successfully",
+            "data": {"agents": [{**agent, "last_activity": now - idle} for agent, idle in _DEMO_AGENTS]}
+        })
+        _ai_agents_response["agents"] = body
+    return Response(body, media_type="application/json")
+
+_AI_AGENTS_STATS_RESPONSE = orjson.dumps({
+    "success": True,
+    "message": "AI agent statistics retrieved successfully",
+    "data": {
+        "total_agents": 3,
+        "active_agents": 2,
+        "inactive_agents": 1,
+        "total_actions_today": 156,
+        "average_success_rate": 91.5,
+        "processing_queue": 5
     }
+})
 
 @router.get("/admin/ai-agents/stats")
 async def get_ai_agents_stats():
     """Get AI agents statistics"""
-    return {
-        "success": True,
-        "message": "AI agent statistics retrieved successfully",
-        "data": {
-            "total_agents": 3,
-            "active_agents": 2,
-            "inactive_agents": 1,
-            "total_actions_today": 156,
-            "average_success_rate": 91.5,
-            "processing_queue": 5
-        }
-    }
+    return Response(_AI_AGENTS_STATS_RESPONSE, media_type="application/json")
 
 @router.get("/admin/ai-agents/activities")
 async def get_ai_agent_activities(
@@ -235,19 +283,7 @@ async def get_ai_agent_activities(
     limit: int = Query(10, ge=1, le=50)
 ):
     """Get recent AI agent activities"""
-    activities = [
-        {
-            "id": f"activity-{i}",
-            "agent_id": f"agent-00{(i % 3) + 1}",
-            "agent_name": ["Issue Classifier", "Sentiment Analyzer", "Priority Detector"][i % 3],
-            "action": ["classified_issue", "analyzed_sentiment", "detected_priority"][i % 3],
-            "target_id": f"issue-{i}",
-            "result": "success" if i % 5 != 0 else "failed",
-            "timestamp": (datetime.now() - timedelta(minutes=i*2)).isoformat(),
-            "details": f"Processed item {i} successfully"
-        }
-        for i in range(1, 31)
-    ]
+    activities = _DEMO_ACTIVITIES
     
     start = (page - 1) * limit
     end = start + limit
@@ -269,38 +305,40 @@ async def get_ai_agent_activities(
     }
 
 # Analytics
+_ANALYTICS_RESPONSE = orjson.dumps({
+    "success": True,
+    "message": "Analytics data retrieved successfully",
+    "data": {
+        "issues_by_category": {
+            "infrastructure": 45,
+            "environment": 32,
+            "transportation": 28,
+            "healthcare": 22,
+            "education": 18,
+            "others": 11
+        },
+        "issues_by_status": {
+            "active": 34,
+            "resolved": 102,
+            "pending": 20
+        },
+        "monthly_trends": [
+            {"month": "Jan", "issues": 23, "resolved": 18},
+            {"month": "Feb", "issues": 34, "resolved": 29},
+            {"month": "Mar", "issues": 45, "resolved": 38},
+            {"month": "Apr", "issues": 39, "resolved": 35},
+            {"month": "May", "issues": 52, "resolved": 44},
+            {"month": "Jun", "issues": 41, "resolved": 37}
+        ],
+        "user_engagement": {
+            "new_users_monthly": 12,
+            "active_users": 78,
+            "total_votes": 1247
+        }
+    }
+})
+
 @router.get("/admin/analytics")
 async def get_admin_analytics():
     """Get analytics data for admin dashboard"""
-    return {
-        "success": True,
-        "message": "Analytics data retrieved successfully",
-        "data": {
-            "issues_by_category": {
-                "infrastructure": 45,
-                "environment": 32,
-                "transportation": 28,
-                "healthcare": 22,
-                "education": 18,
-                "others": 11
-            },
-            "issues_by_status": {
-                "active": 34,
-                "resolved": 102,
-                "pending": 20
-            },
-            "monthly_trends": [
-                {"month": "Jan", "issues": 23, "resolved": 18},
-                {"month": "Feb", "issues": 34, "resolved": 29},
-                {"month": "Mar", "issues": 45, "resolved": 38},
-                {"month": "Apr", "issues": 39, "resolved": 35},
-                {"month": "May", "issues": 52, "resolved": 44},
-                {"month": "Jun", "issues": 41, "resolved": 37}
-            ],
-            "user_engagement": {
-                "new_users_monthly": 12,
-                "active_users": 78,
-                "total_votes": 1247
-            }
-        }
-    }
\ No newline at end of file
+    return Response(_ANALYTICS_RESPONSE, media_type="application/json")
@@ -2,25 +2,29 @@
 Issue-related API endpoints with asynchronous AI processing
 Updated to use Firestore database instead of PostgreSQL
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, UploadFile, File, Form, Request, Response
 from typing import Dict, Any, Optional, List
 import json
 import uuid
+import asyncio
 import logging
 from datetime import datetime
 
 from models.schemas import (
     Issue, IssueCreate, IssueUpdate, ApiResponse, PaginatedResponse, 
     PaginationInfo, IssueCategory, IssuePriority, IssueStatus,
-    FileUploadResponse
+    FileUploadResponse, parse_status, parse_category, parse_priority
 )
+from models.bodies import IssueCreateBody, json_body, openapi_body
 from core.auth import get_current_user, get_current_user_optional
 from core.firestore_db import (
-    get_user, create_issue, get_issue, get_issues, 
+    get_user, create_issue, get_issue, get_issues, count_issues,
     get_nearby_issues, update_issue, vote_on_issue, get_user_vote,
-    add_issue_update, get_issue_updates
+    add_issue_update, get_issue_updates, ISSUE_LISTING_FIELDS,
+    get_user_issues as load_user_issues
 )
 from core.firebase_storage import get_storage_manager
+from core.http_cache import weak_etag, not_modified
 
 # Import background tasks - make optional for development
 try:
@@ -38,99 +42,84 @@ except ImportError:
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Status mapping for legacy compatibility
-STATUS_MAPPING = {
-    # Legacy status -> New status
-    'pending': 'Submitted',
-    'in-progress': 'In Progress', 
-    'resolved': 'Resolved',
-    'rejected': 'Resolved',  # Map rejected to resolved for now
-    'open': 'Submitted',  # Legacy 'open' -> 'Submitted'
-    # Current status (ensure they pass through)
-    'Submitted': 'Submitted',
-    'In Progress': 'In Progress',
-    'Resolved': 'Resolved'
-}
-
-def normalize_status(status: str) -> str:
-    """Convert legacy status values to current format"""
-    return STATUS_MAPPING.get(status, 'Submitted')  # Default to Submitted if unknown
-
-# Category mapping for legacy compatibility
-CATEGORY_MAPPING = {
-    # Legacy/alternative categories -> Current categories
-    'infrastructure': 'Infrastructure',
-    'public-works': 'Public Works',
-    'public_works': 'Public Works',
-    'sanitation': 'Sanitation',
-    'electrical': 'Electrical',
-    'general': 'General',
-    'roads': 'Roads',
-    'water': 'Water',
-    'waste': 'Waste',
-    # Current categories (ensure they pass through)
-    'Sanitation': 'Sanitation',
-    'Public Works': 'Public Works',
-    'Electrical': 'Electrical',
-    'General': 'General',
-    'Infrastructure': 'Infrastructure',
-    'Water': 'Water',
-    'Roads': 'Roads',
-    'Waste': 'Waste'
-}
-
-def normalize_category(category: str) -> str:
-    """Convert legacy category values to current format"""
-    return CATEGORY_MAPPING.get(category, 'General')  # Default to General if unknown
-
-# Priority mapping for legacy compatibility
-PRIORITY_MAPPING = {
-    # Legacy priority -> Current priority
-    'low': 'Low',
-    'medium': 'Medium', 
-    'high': 'High',
-    'urgent': 'Critical',
-    'critical': 'Critical',
-    # Current priorities (ensure they pass through)
-    'Low': 'Low',
-    'Medium': 'Medium',
-    'High': 'High',
-    'Critical': 'Critical'
-}
-
-def normalize_priority(priority: str) -> str:
-    """Convert legacy priority values to current format"""
-    return PRIORITY_MAPPING.get(priority, 'Medium')  # Default to Medium if unknown
-
 def safe_get_author_name(issue_data: dict) -> str:
     """Safely get author name, handling None values"""
     return issue_data.get("authorName") or "Unknown User"
 
 router = APIRouter()
 
-# Category and priority mapping functions
+# Frontend category/priority names -> backend enums
+FRONTEND_CATEGORIES = {
+    'sanitation': IssueCategory.SANITATION,
+    'infrastructure': IssueCategory.PUBLIC_WORKS,
+    'electrical': IssueCategory.ELECTRICAL,
+    'general': IssueCategory.GENERAL,
+    'water': IssueCategory.PUBLIC_WORKS,
+    'transport': IssueCategory.PUBLIC_WORKS,
+    'safety': IssueCategory.GENERAL
+}
+
+FRONTEND_PRIORITIES = {
+    'low': IssuePriority.LOW,
+    'medium': IssuePriority.MEDIUM,
+    'high': IssuePriority.HIGH,
+    'urgent': IssuePriority.CRITICAL
+}
+
 def map_category(category: str) -> IssueCategory:
     """Map frontend category to backend enum"""
-    mapping = {
-        'sanitation': IssueCategory.SANITATION,
-        'infrastructure': IssueCategory.PUBLIC_WORKS,
-        'electrical': IssueCategory.ELECTRICAL,
-        'general': IssueCategory.GENERAL,
-        'water': IssueCategory.PUBLIC_WORKS,
-        'transport': IssueCategory.PUBLIC_WORKS,
-        'safety': IssueCategory.GENERAL
-    }
-    return mapping.get(category.lower(), IssueCategory.GENERAL)
+    return FRONTEND_CATEGORIES.get(category.lower(), IssueCategory.GENERAL)
 
 def map_priority(priority: str) -> IssuePriority:
     """Map frontend priority to backend enum"""
-    mapping = {
-        'low': IssuePriority.LOW,
-        'medium': IssuePriority.MEDIUM,
-        'high': IssuePriority.HIGH,
-        'urgent': IssuePriority.CRITICAL
+    return FRONTEND_PRIORITIES.get(priority.lower(), IssuePriority.MEDIUM)
+
+def _issue_to_response(issue_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Firestore issue dict in the API's Issue format"""
+    # Create location object
+    location = {
+        "latitude": issue_data.get("latitude"),
+        "longitude": issue_data.get("longitude"),
+        "address": issue_data.get("address", "")
     }
-    return mapping.get(priority.lower(), IssuePriority.MEDIUM)
+    
+    # Parse imageUrls
+    image_urls = issue_data.get("imageUrls", [])
+    if isinstance(image_urls, str):
+        try:
+            image_urls = json.loads(image_urls)
+        except:
+            image_urls = [image_urls] if image_urls else []
+    
+    # Handle createdAt safely
+    created_at = issue_data.get("createdAt")
+    if created_at:
+        if hasattr(created_at, 'isoformat'):
+            created_at_str = created_at.isoformat()
+        else:
+            created_at_str = str(created_at)
+    else:
+        created_at_str = ""
+    
+    issue = Issue(
+        issueId=issue_data["id"],
+        authorId=issue_data.get("userId", ""),
+        authorName=safe_get_author_name(issue_data),
+        authorProfileImageUrl=issue_data.get("authorProfileImageUrl", ""),
+        title=issue_data["title"],
+        description=issue_data["description"],
+        aiSummary=issue_data.get("aiSummary", ""),
+        imageUrl=image_urls[0] if image_urls else "",
+        imageUrls=image_urls,
+        audioUrl=issue_data.get("audioUrl", ""),
+        location=location,
+        status=parse_status(issue_data.get("status")),
+        category=parse_category(issue_data.get("category")),
+        priority=parse_priority(issue_data.get("priority")),
+        upvotes=issue_data.get("voteCount", 0),
+        createdAt=created_at_str
+    )
+    return issue.model_dump()
 
 @router.get("/issues", response_model=PaginatedResponse)
 async def get_issues_route(
@@ -139,10 +128,14 @@ async def get_issues_route(
     category: Optional[str] = Query(None),
     issue_status: Optional[str] = Query(None, alias="status"),
     priority: Optional[str] = Query(None),
+    start_after: Optional[str] = Query(None),
     current_user: Optional[Dict[str, Any]] = Depends(get_current_user_optional)
 ) -> PaginatedResponse:
     """
     Get paginated list of issues with optional filtering
+    
+    Pages are counted from the newest issue, or from the issue after start_after
+    (the ID of the last issue already shown) when it is given.
     """
     print(f"🔍 GET /api/issues called with params:")
     print(f"  📄 page: {page}, limit: {limit}")
@@ -161,15 +154,22 @@ async def get_issues_route(
             mapped_priority = map_priority(priority).value
             print(f"  ⚡ mapped priority: {mapped_priority}")
         
+        offset = 0 if start_after else (page - 1) * limit
         print(f"📋 Calling get_issues with filters:")
-        print(f"  limit={limit * 3}, category={mapped_category}, status={issue_status}, priority={mapped_priority}")
-        
-        # Get issues from Firestore
-        all_issues = await get_issues(
-            limit=limit * 3,  # Get more to handle filtering and pagination
-            category=mapped_category,
-            status=issue_status,
-            priority=mapped_priority
+        print(f"  limit={limit + 1}, offset={offset}, category={mapped_category}, status={issue_status}, priority={mapped_priority}")
+        
+        # Get this page from Firestore, plus one issue to tell whether there is
+        # a next page, and count every matching issue alongside
+        filters = {"category": mapped_category, "status": issue_status, "priority": mapped_priority}
+        all_issues, total = await asyncio.gather(
+            get_issues(
+                limit=limit + 1,
+                start_after=start_after,
+                offset=offset,
+                fields=ISSUE_LISTING_FIELDS,
+                **filters
+            ),
+            count_issues(**filters)
         )
         
         print(f"📊 Raw issues retrieved from Firestore: {len(all_issues)}")
@@ -178,6 +178,11 @@ async def get_issues_route(
         else:
             print("⚠️ No issues found in Firestore!")
         
+        # Handle pagination
+        has_next = len(all_issues) > limit
+        all_issues = all_issues[:limit]
+        has_prev = page > 1 or bool(start_after)
+        
         # Convert Firestore format to API format
         issues = []
         print(f"🔄 Converting {len(all_issues)} issues from Firestore to API format...")
@@ -188,64 +193,11 @@ async def get_issues_route(
                 print(f"      Status: {issue_data.get('status', 'NO_STATUS')}")
                 print(f"      Category: {issue_data.get('category', 'NO_CATEGORY')}")
                 
-                # Create location object
-                location = {
-                    "latitude": issue_data.get("latitude"),
-                    "longitude": issue_data.get("longitude"),
-                    "address": issue_data.get("address", "")
-                }
-                
-                # Parse imageUrls
-                image_urls = issue_data.get("imageUrls", [])
-                if isinstance(image_urls, str):
-                    try:
-                        image_urls = json.loads(image_urls)
-                    except:
-                        image_urls = [image_urls] if image_urls else []
-                
-                # Handle createdAt safely
-                created_at = issue_data.get("createdAt")
-                if created_at:
-                    if hasattr(created_at, 'isoformat'):
-                        created_at_str = created_at.isoformat()
-                    else:
-                        created_at_str = str(created_at)
-                else:
-                    created_at_str = ""
-                
-                issue = Issue(
-                    issueId=issue_data["id"],
-                    authorId=issue_data.get("userId", ""),
-                    authorName=safe_get_author_name(issue_data),
-                    authorProfileImageUrl=issue_data.get("authorProfileImageUrl", ""),
-                    title=issue_data["title"],
-                    description=issue_data["description"],
-                    aiSummary=issue_data.get("aiSummary", ""),
-                    imageUrl=image_urls[0] if image_urls else "",
-                    imageUrls=image_urls,
-                    audioUrl=issue_data.get("audioUrl", ""),
-                    location=location,
-                    status=IssueStatus(normalize_status(issue_data.get("status", "Submitted"))),
-                    category=IssueCategory(normalize_category(issue_data.get("category", "General"))),
-                    priority=IssuePriority(normalize_priority(issue_data.get("priority", "Medium"))),
-                    upvotes=issue_data.get("voteCount", 0),
-                    createdAt=created_at_str
-                )
-                issues.append(issue.dict())
+                issues.append(_issue_to_response(issue_data))
             except Exception as issue_error:
                 print(f"❌ Error processing issue {issue_data.get('id', 'unknown')}: {issue_error}")
                 continue
         
-        # Handle pagination
-        total = len(issues)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_issues = issues[start_idx:end_idx]
-        
-        # Calculate pagination info
-        has_next = end_idx < total
-        has_prev = page > 1
-        
         pagination = PaginationInfo(
             page=page,
             limit=limit,
@@ -256,7 +208,7 @@ async def get_issues_route(
         
         return PaginatedResponse(
             success=True,
-            data=paginated_issues,
+            data=issues,
             pagination=pagination,
             message="Issues retrieved successfully"
         )
@@ -280,82 +232,37 @@ async def get_user_issues(
     try:
         user_id = current_user["uid"]
         
-        # Get user's issues from Firestore
-        user_issues = await get_issues(
-            limit=limit * 3,  # Get more to handle filtering and pagination
-            user_id=user_id,
-            status=issue_status
+        # Get the user's issues up to the end of this page, plus one to tell
+        # whether there is a next page, and count them all alongside; a failed
+        # read raises rather than coming back as a short list
+        start_idx = (page - 1) * limit
+        user_issues, total = await asyncio.gather(
+            load_user_issues(user_id, limit=start_idx + limit + 1, status=issue_status),
+            count_issues(user_id=user_id, status=issue_status)
         )
+        has_next = len(user_issues) > start_idx + limit
+        user_issues = user_issues[start_idx:start_idx + limit]
         
         # Convert Firestore format to API format
         issues = []
         for issue_data in user_issues:
             try:
-                # Create location object
-                location = {
-                    "latitude": issue_data.get("latitude"),
-                    "longitude": issue_data.get("longitude"),
-                    "address": issue_data.get("address", "")
-                }
-                
-                # Parse imageUrls
-                image_urls = issue_data.get("imageUrls", [])
-                if isinstance(image_urls, str):
-                    try:
-                        image_urls = json.loads(image_urls)
-                    except:
-                        image_urls = [image_urls] if image_urls else []
-                
-                # Handle createdAt safely
-                created_at = issue_data.get("createdAt")
-                if created_at:
-                    if hasattr(created_at, 'isoformat'):
-                        created_at_str = created_at.isoformat()
-                    else:
-                        created_at_str = str(created_at)
-                else:
-                    created_at_str = ""
-                
-                issue = Issue(
-                    issueId=issue_data["id"],
-                    authorId=issue_data.get("userId", ""),
-                    authorName=safe_get_author_name(issue_data),
-                    authorProfileImageUrl=issue_data.get("authorProfileImageUrl", ""),
-                    title=issue_data["title"],
-                    description=issue_data["description"],
-                    aiSummary=issue_data.get("aiSummary", ""),
-                    imageUrl=image_urls[0] if image_urls else "",
-                    imageUrls=image_urls,
-                    audioUrl=issue_data.get("audioUrl", ""),
-                    location=location,
-                    status=IssueStatus(normalize_status(issue_data.get("status", "Submitted"))),
-                    category=IssueCategory(normalize_category(issue_data.get("category", "General"))),
-                    priority=IssuePriority(normalize_priority(issue_data.get("priority", "Medium"))),
-                    upvotes=issue_data.get("voteCount", 0),
-                    createdAt=created_at_str
-                )
-                issues.append(issue.dict())
+                issues.append(_issue_to_response(issue_data))
             except Exception as issue_error:
                 print(f"❌ Error processing issue {issue_data.get('id', 'unknown')}: {issue_error}")
                 continue
         
-        # Handle pagination
-        total = len(issues)
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_issues = issues[start_idx:end_idx]
-        
         pagination = PaginationInfo(
             page=page,
             limit=limit,
             total=total,
-            hasNext=end_idx < total,
+            hasNext=has_next,
             hasPrev=page > 1
         )
         
         return PaginatedResponse(
             success=True,
-            data=paginated_issues,
+            data=issues,
             pagination=pagination,
             message="User issues retrieved successfully"
         )
@@ -371,10 +278,10 @@ async def options_issues():
     """Handle CORS preflight requests for issues endpoint"""
     return {}
 
-@router.post("/issues", status_code=202, response_model=ApiResponse)
+@router.post("/issues", status_code=202, response_model=ApiResponse, openapi_extra=openapi_body(IssueCreate))
 async def create_issue_route(
     background_tasks: BackgroundTasks,
-    issue_data: IssueCreate,
+    issue_data: IssueCreateBody = Depends(json_body(IssueCreateBody)),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ) -> ApiResponse:
     """
@@ -514,7 +421,7 @@ async def get_issues_for_map(
     """
     try:
         # Get all issues from Firestore
-        issues = await get_issues()
+        issues = await get_issues(fields=ISSUE_LISTING_FIELDS)
         
         # Filter and format issues for map display
         map_issues = []
@@ -559,13 +466,13 @@ async def get_issues_for_map(
                         imageUrls=image_urls,
                         audioUrl=issue.get("audioUrl", ""),
                         location=location,
-                        status=IssueStatus(normalize_status(issue.get("status", "Submitted"))),
-                        category=IssueCategory(normalize_category(issue.get("category", "General"))),
-                        priority=IssuePriority(normalize_priority(issue.get("priority", "Medium"))),
+                        status=parse_status(issue.get("status")),
+                        category=parse_category(issue.get("category")),
+                        priority=parse_priority(issue.get("priority")),
                         upvotes=issue.get("voteCount", 0),
                         createdAt=created_at_str
                     )
-                    map_issues.append(issue_obj.dict())
+                    map_issues.append(issue_obj.model_dump())
             except Exception as issue_error:
                 print(f"❌ Error processing map issue {issue.get('id', 'unknown')}: {issue_error}")
                 continue
@@ -585,6 +492,8 @@ async def get_issues_for_map(
 @router.get("/issues/{issue_id}", response_model=ApiResponse)
 async def get_issue_route(
     issue_id: str,
+    request: Request,
+    response: Response,
     current_user: Optional[Dict[str, Any]] = Depends(get_current_user_optional)
 ) -> ApiResponse:
     """
@@ -598,53 +507,16 @@ async def get_issue_route(
                 detail="Issue not found"
             )
         
-        # Create location object
-        location = {
-            "latitude": issue_data.get("latitude"),
-            "longitude": issue_data.get("longitude"),
-            "address": issue_data.get("address", "")
-        }
-        
-        # Parse imageUrls
-        image_urls = issue_data.get("imageUrls", [])
-        if isinstance(image_urls, str):
-            try:
-                image_urls = json.loads(image_urls)
-            except:
-                image_urls = [image_urls] if image_urls else []
-        
-        # Handle createdAt safely
-        created_at = issue_data.get("createdAt")
-        if created_at:
-            if hasattr(created_at, 'isoformat'):
-                created_at_str = created_at.isoformat()
-            else:
-                created_at_str = str(created_at)
-        else:
-            created_at_str = ""
-        
-        issue = Issue(
-            issueId=issue_data["id"],
-            authorId=issue_data.get("userId", ""),
-            authorName=safe_get_author_name(issue_data),
-            authorProfileImageUrl=issue_data.get("authorProfileImageUrl", ""),
-            title=issue_data["title"],
-            description=issue_data["description"],
-            aiSummary=issue_data.get("aiSummary", ""),
-            imageUrl=image_urls[0] if image_urls else "",
-            imageUrls=image_urls,
-            audioUrl=issue_data.get("audioUrl", ""),
-            location=location,
-            status=IssueStatus(normalize_status(issue_data.get("status", "Submitted"))),
-            category=IssueCategory(normalize_category(issue_data.get("category", "General"))),
-            priority=IssuePriority(normalize_priority(issue_data.get("priority", "Medium"))),
-            upvotes=issue_data.get("voteCount", 0),
-            createdAt=created_at_str
-        )
+        # Edits bump updatedAt; votes only change the (shard-summed) vote count
+        version = issue_data.get("updatedAt") or issue_data.get("createdAt")
+        if version:
+            cached = not_modified(request, response, weak_etag(issue_id, version, issue_data.get("voteCount", 0)))
+            if cached:
+                return cached
         
         return ApiResponse(
             success=True,
-            data=issue.dict(),
+            data=_issue_to_response(issue_data),
             message="Issue retrieved successfully"
         )
         
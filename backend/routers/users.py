@@ -2,11 +2,14 @@
 User-related API endpoints
 Updated to use Firestore database
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from typing import Dict, Any
+import msgspec
 
 from models.schemas import UserProfile, UserProfileUpdate, ApiResponse, UserStats
+from models.bodies import UserProfileUpdateBody, json_body, openapi_body
 from core.auth import get_current_user
+from core.http_cache import weak_etag, not_modified
 from core.firestore_db import (
     get_user, 
     create_user,
@@ -18,6 +21,8 @@ router = APIRouter()
 
 @router.get("/users/me", response_model=ApiResponse)
 async def get_user_profile(
+    request: Request,
+    response: Response,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ) -> ApiResponse:
     """
@@ -70,6 +75,13 @@ async def get_user_profile(
                     message="User profile retrieved from auth (database unavailable)"
                 )
         
+        # Profile writes all go through update_user, which bumps updatedAt
+        version = user_data.get("updatedAt") or user_data.get("createdAt")
+        if version:
+            cached = not_modified(request, response, weak_etag(user_id, version))
+            if cached:
+                return cached
+        
         # Add ID from auth if not present
         if user_data and "uid" not in user_data:
             user_data["uid"] = user_id
@@ -100,9 +112,9 @@ async def get_user_profile(
             message=f"Profile retrieved with limited data: {str(e)}"
         )
 
-@router.put("/users/me", response_model=ApiResponse)
+@router.put("/users/me", response_model=ApiResponse, openapi_extra=openapi_body(UserProfileUpdate))
 async def update_user_profile(
-    profile_update: UserProfileUpdate,
+    profile_update: UserProfileUpdateBody = Depends(json_body(UserProfileUpdateBody)),
     current_user: Dict[str, Any] = Depends(get_current_user)
 ) -> ApiResponse:
     """
@@ -113,8 +125,7 @@ async def update_user_profile(
         
         # Convert update data to dict, excluding None values
         update_data = {
-            k: v for k, v in profile_update.dict().items() 
-            if v is not None
+            field: value for field, value in msgspec.structs.asdict(profile_update).items() if value is not None
         }
         
         success = await update_user(user_id, update_data)